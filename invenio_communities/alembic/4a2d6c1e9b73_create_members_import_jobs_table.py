@@ -0,0 +1,103 @@
+# SPDX-FileCopyrightText: 2026 CERN.
+# SPDX-License-Identifier: MIT
+
+"""Create members import jobs and results tables."""
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+from sqlalchemy_utils import UUIDType
+
+# revision identifiers, used by Alembic.
+revision = "4a2d6c1e9b73"
+down_revision = "1777209602"
+branch_labels = ()
+depends_on = None
+
+
+def upgrade():
+    """Upgrade database."""
+    op.create_table(
+        "communities_members_import_jobs",
+        sa.Column("created", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("updated", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("id", UUIDType(), nullable=False),
+        sa.Column("community_id", UUIDType(), nullable=False),
+        sa.Column("user_id", sa.Integer(), nullable=True),
+        sa.Column("submitted_by_system", sa.Boolean(), nullable=False),
+        sa.Column("action", sa.String(length=20), nullable=False),
+        sa.Column("status", sa.String(length=20), nullable=False),
+        sa.Column(
+            "entries",
+            sa.JSON().with_variant(postgresql.JSONB(), "postgresql"),
+            nullable=False,
+        ),
+        sa.Column("total", sa.Integer(), nullable=False),
+        sa.Column("processed", sa.Integer(), nullable=False),
+        sa.Column("started_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("finished_at", sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(
+            ["community_id"],
+            ["communities_metadata.id"],
+            name=op.f(
+                "fk_communities_members_import_jobs_community_id_communities_metadata"
+            ),
+            ondelete="CASCADE",
+        ),
+        sa.ForeignKeyConstraint(
+            ["user_id"],
+            ["accounts_user.id"],
+            name=op.f("fk_communities_members_import_jobs_user_id_accounts_user"),
+            ondelete="SET NULL",
+        ),
+        sa.PrimaryKeyConstraint("id", name=op.f("pk_communities_members_import_jobs")),
+    )
+    op.create_index(
+        op.f("ix_communities_members_import_jobs_community_id"),
+        "communities_members_import_jobs",
+        ["community_id"],
+        unique=False,
+    )
+    op.create_table(
+        "communities_members_import_results",
+        sa.Column("id", sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column("job_id", UUIDType(), nullable=False),
+        sa.Column("row", sa.Integer(), nullable=False),
+        sa.Column("status", sa.String(length=20), nullable=False),
+        sa.Column("member_type", sa.String(length=20), nullable=True),
+        sa.Column("member_id", sa.String(length=255), nullable=True),
+        sa.Column("role", sa.String(length=50), nullable=True),
+        sa.Column("message", sa.Text(), nullable=True),
+        sa.ForeignKeyConstraint(
+            ["job_id"],
+            ["communities_members_import_jobs.id"],
+            name=op.f(
+                "fk_communities_members_import_results_job_id_"
+                "communities_members_import_jobs"
+            ),
+            ondelete="CASCADE",
+        ),
+        sa.PrimaryKeyConstraint(
+            "id", name=op.f("pk_communities_members_import_results")
+        ),
+    )
+    op.create_index(
+        op.f("ix_communities_members_import_results_job_id"),
+        "communities_members_import_results",
+        ["job_id"],
+        unique=False,
+    )
+
+
+def downgrade():
+    """Downgrade database."""
+    op.drop_index(
+        op.f("ix_communities_members_import_results_job_id"),
+        table_name="communities_members_import_results",
+    )
+    op.drop_table("communities_members_import_results")
+    op.drop_index(
+        op.f("ix_communities_members_import_jobs_community_id"),
+        table_name="communities_members_import_jobs",
+    )
+    op.drop_table("communities_members_import_jobs")
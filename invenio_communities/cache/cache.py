@@ -6,14 +6,29 @@
 from abc import ABC, abstractmethod
 
 from flask import current_app
+from invenio_base.utils import obj_or_import_string
 from werkzeug.utils import cached_property
 
+from .metrics import CacheMetrics
+
 
 class IdentityCache(ABC):
-    """Abstract cache layer."""
+    """Abstract cache layer.
+
+    Implementations record their activity in ``metrics``: the ``gets``,
+    ``hits``, ``misses``, ``sets``, ``appends``, ``deletes`` and ``flushes``
+    counters, and the ``payload_bytes`` read and written.
+    """
 
     def __init__(self, app=None):
         """Initialize the cache."""
+        app = app or current_app
+        hooks = app.config.get("COMMUNITIES_IDENTITIES_CACHE_METRICS_HOOKS", [])
+        self.metrics = CacheMetrics(hooks=[obj_or_import_string(h) for h in hooks])
+
+    def stats(self):
+        """Return the metrics of the cache."""
+        return self.metrics.snapshot()
 
     @cached_property
     def timeout(self):
@@ -36,6 +51,15 @@ class IdentityCache(ABC):
         :param timeout: the cache timeout in seconds
         """
 
+    def set_many(self, mapping, timeout=None):
+        """Cache several objects.
+
+        :param mapping: a dict of keys and objects to store
+        :param timeout: the cache timeout in seconds
+        """
+        for key, value in mapping.items():
+            self.set(key, value, timeout=timeout)
+
     @abstractmethod
     def delete(self, key):
         """Delete the specific key."""
@@ -45,5 +69,32 @@ class IdentityCache(ABC):
         """Flush the cache."""
 
     @abstractmethod
-    def append(self):
-        """Flush the cache."""
+    def append(self, key, value):
+        """Add a value to the collection stored under the key.
+
+        :param key: the collection's key
+        :param value: the value to add
+        """
+
+    def append_many(self, keys, value):
+        """Add a value to the collections stored under each of the keys."""
+        for key in keys:
+            self.append(key, value)
+
+    def append_values(self, mapping):
+        """Add values to the collections stored under each of the keys.
+
+        :param mapping: a dict of keys and iterables of values to add
+        """
+        for key, values in mapping.items():
+            for value in values:
+                self.append(key, value)
+
+    def values(self, key):
+        """Return the values added to the collection stored under the key."""
+        return self.get(key) or []
+
+    def delete_many(self, keys):
+        """Delete the specific keys."""
+        for key in keys:
+            self.delete(key)
@@ -0,0 +1,85 @@
+# SPDX-FileCopyrightText: 2026 CERN.
+# SPDX-License-Identifier: MIT
+
+"""Compact encoding of cached community roles.
+
+The community roles of an identity are encoded as a header, followed by the
+16-byte UUIDs of all communities and one byte per community with the index of
+the role in the roles registry::
+
+    | version | roles fingerprint | count | uuid * count | role index * count |
+
+The fingerprint is computed from the ordered role names, so that entries
+written with a different roles configuration are ignored instead of being
+decoded to wrong roles.
+"""
+
+import struct
+import zlib
+from uuid import UUID
+
+CODEC_VERSION = 1
+"""Version of the encoding, stored as first byte of the payload."""
+
+_HEADER = struct.Struct(">BII")
+
+
+def _fingerprint(role_names):
+    """Compute a fingerprint of the ordered role names."""
+    return zlib.crc32("\0".join(role_names).encode("utf-8"))
+
+
+def encode_community_roles(community_roles, role_names):
+    """Encode a list of ``(community_id, role)`` pairs.
+
+    If a role can't be represented as an index (unknown role or more than 256
+    roles), the list is returned as-is.
+
+    :param community_roles: list of (community id, role name) pairs.
+    :param role_names: ordered list of the role names of the registry.
+    :return: the encoded bytes.
+    """
+    if len(role_names) > 256:
+        return list(community_roles)
+    index = {name: i for i, name in enumerate(role_names)}
+    try:
+        roles = bytes(index[role] for _, role in community_roles)
+    except KeyError:
+        return list(community_roles)
+    header = _HEADER.pack(CODEC_VERSION, _fingerprint(role_names), len(roles))
+    uuids = b"".join(UUID(str(c_id)).bytes for c_id, _ in community_roles)
+    return header + uuids + roles
+
+
+def decode_community_roles(value, role_names):
+    """Decode cached community roles.
+
+    Lists written before the encoding was introduced are returned as-is.
+
+    :param value: the cached value.
+    :param role_names: ordered list of the role names of the registry.
+    :return: list of (community id, role name) pairs, or ``None`` if the
+        value is missing or can't be decoded.
+    """
+    if value is None or isinstance(value, list):
+        return value
+    if not isinstance(value, bytes) or len(value) < _HEADER.size:
+        return None
+
+    version, fingerprint, count = _HEADER.unpack_from(value)
+    if version != CODEC_VERSION or fingerprint != _fingerprint(role_names):
+        return None
+    if len(value) != _HEADER.size + 17 * count:
+        return None
+
+    uuids_end = _HEADER.size + 16 * count
+    h = value[_HEADER.size : uuids_end].hex()
+    roles = value[uuids_end:]
+    return [
+        (
+            f"{h[i:i + 8]}-{h[i + 8:i + 12]}-{h[i + 12:i + 16]}-"
+            f"{h[i + 16:i + 20]}-{h[i + 20:i + 32]}",
+            role_names[role],
+        )
+        for i, role in zip(range(0, len(h), 32), roles)
+    ]
@@ -0,0 +1,94 @@
+# SPDX-FileCopyrightText: 2026 CERN.
+# SPDX-License-Identifier: MIT
+
+"""In-process LRU cache with TTL expiry."""
+
+import threading
+from collections import OrderedDict
+from time import monotonic
+
+
+class LRUCache:
+    """Bounded, thread-safe LRU mapping with per-entry expiry.
+
+    Entries can be given a size, in which case the cache also evicts the
+    least recently used entries to stay under ``maxbytes``.
+
+    Every entry is stamped with the cache version at the time it was read
+    from the backing store. Clearing the cache bumps the version, so that a
+    value read before the clear can no longer be stored afterwards.
+    """
+
+    def __init__(self, maxsize, timeout, maxbytes=None):
+        """Constructor.
+
+        :param maxsize: the maximum number of entries kept.
+        :param timeout: the default entry lifetime in seconds.
+        :param maxbytes: the maximum total size of the entries kept.
+        """
+        self.maxsize = maxsize
+        self.timeout = timeout
+        self.maxbytes = maxbytes
+        self.version = 0
+        self.bytes = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        """Return the number of entries (including expired ones)."""
+        return len(self._data)
+
+    def get(self, key):
+        """Return the value of a live entry or ``None``."""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            expires_at, version, value, size = entry
+            if expires_at <= monotonic() or version != self.version:
+                del self._data[key]
+                self.bytes -= size
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value, timeout=None, version=None, size=0):
+        """Store an entry, evicting the least recently used ones if needed.
+
+        :param timeout: the entry lifetime in seconds (defaults to ``timeout``).
+        :param version: the cache version at the time the value was read. The
+            entry is discarded if the cache was cleared in the meantime.
+        :param size: the size of the value in bytes.
+        :return: ``True`` if the entry was stored.
+        """
+        timeout = self.timeout if timeout is None else min(timeout, self.timeout)
+        with self._lock:
+            if version is not None and version != self.version:
+                return False
+            self._pop(key)
+            self._data[key] = (monotonic() + timeout, self.version, value, size)
+            self.bytes += size
+            while len(self._data) > self.maxsize or (
+                self.maxbytes is not None and self.bytes > self.maxbytes
+            ):
+                _, (_, _, _, evicted_size) = self._data.popitem(last=False)
+                self.bytes -= evicted_size
+            return True
+
+    def delete(self, key):
+        """Delete an entry."""
+        with self._lock:
+            self._pop(key)
+
+    def clear(self):
+        """Delete all entries and bump the version."""
+        with self._lock:
+            self.version += 1
+            self._data.clear()
+            self.bytes = 0
+
+    def _pop(self, key):
+        """Remove an entry and release its size (lock must be held)."""
+        entry = self._data.pop(key, None)
+        if entry is not None:
+            self.bytes -= entry[3]
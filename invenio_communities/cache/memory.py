@@ -0,0 +1,118 @@
+# SPDX-FileCopyrightText: 2026 CERN.
+# SPDX-License-Identifier: MIT
+
+"""Implements an in-process memory cache."""
+
+import pickle
+import threading
+
+from flask import current_app
+
+from invenio_communities.cache.cache import IdentityCache
+from invenio_communities.cache.lru import LRUCache
+
+
+class ValueSet(set):
+    """Set of appended values keeping track of their size."""
+
+    nbytes = 0
+
+
+class IdentityMemoryCache(IdentityCache):
+    """In-process memory cache.
+
+    Values are stored pickled, so that callers never share mutable objects
+    with the cache and the memory used by each entry can be accounted for.
+
+    The cache is local to the process: invalidations are not seen by other
+    processes. It is meant for single-process deployments, CLI workers and
+    tests.
+    """
+
+    def __init__(self, app=None):
+        """Initialize the cache."""
+        super().__init__(app=app)
+        app = app or current_app
+        self.cache = LRUCache(
+            maxsize=app.config["COMMUNITIES_IDENTITIES_CACHE_MEMORY_MAXSIZE"],
+            maxbytes=app.config["COMMUNITIES_IDENTITIES_CACHE_MEMORY_MAXBYTES"],
+            timeout=app.config["COMMUNITIES_IDENTITIES_CACHE_TIME"],
+        )
+        self._append_lock = threading.Lock()
+
+    @property
+    def size(self):
+        """Return the memory used by the cached values in bytes."""
+        return self.cache.bytes
+
+    def _values_key(self, key):
+        """Return the key of a set."""
+        return f"values:{key}"
+
+    def get(self, key):
+        """Return the key value.
+
+        :param key: the object's key
+        :return: the stored object
+        """
+        value = self.cache.get(key)
+        self.metrics.incr("gets")
+        if value is None:
+            self.metrics.incr("misses")
+            return None
+        self.metrics.incr("hits")
+        self.metrics.incr("payload_bytes.read", len(value))
+        return pickle.loads(value)
+
+    def set(self, key, value, timeout=None):
+        """Cache the object.
+
+        :param key: the object's key
+        :param value: the stored object
+        :param timeout: the cache timeout in seconds
+        """
+        value = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        self.cache.set(key, value, timeout=timeout or self.timeout, size=len(value))
+        self.metrics.incr("sets")
+        self.metrics.incr("payload_bytes.written", len(value))
+
+    def delete(self, key):
+        """Delete the specific key."""
+        self.cache.delete(key)
+        self.metrics.incr("deletes")
+
+    def flush(self):
+        """Flush the cache."""
+        self.cache.clear()
+        self.metrics.incr("flushes")
+
+    def append(self, key, value):
+        """Add a value to the set stored under the key.
+
+        :param key: the set's key
+        :param value: the value to add
+        """
+        self.append_many([key], value)
+
+    def append_many(self, keys, value):
+        """Add a value to the sets stored under each of the keys."""
+        keys = list(keys)
+        value = str(value)
+        with self._append_lock:
+            for key in keys:
+                values_key = self._values_key(key)
+                values = self.cache.get(values_key)
+                if values is None:
+                    values = ValueSet()
+                if value not in values:
+                    values.add(value)
+                    values.nbytes += len(value)
+                self.cache.set(
+                    values_key, values, timeout=self.timeout, size=values.nbytes
+                )
+        self.metrics.incr("appends", len(keys))
+
+    def values(self, key):
+        """Return the values of the set stored under the key."""
+        with self._append_lock:
+            return list(self.cache.get(self._values_key(key)) or [])
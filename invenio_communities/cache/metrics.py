@@ -0,0 +1,80 @@
+# SPDX-FileCopyrightText: 2026 CERN.
+# SPDX-License-Identifier: MIT
+
+"""Identity cache metrics."""
+
+import threading
+from collections import Counter
+from time import monotonic
+
+
+class CacheMetrics:
+    """Counters and histograms of an identity cache.
+
+    Metrics are aggregated in-process. Each recorded value is also passed to
+    the hooks, which are callables taking the kind of metric (``"counter"``
+    or ``"histogram"``), its name and the value, e.g. to forward them to a
+    monitoring system.
+
+    If a sink is given, the values aggregated since the last call are passed
+    to it at most every ``interval`` seconds, e.g. to share them between
+    processes.
+    """
+
+    buckets = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1)
+    """Upper bounds of the histogram buckets, in seconds."""
+
+    def __init__(self, hooks=None, sink=None, interval=10):
+        """Constructor."""
+        self.hooks = list(hooks or [])
+        self.sink = sink
+        self.interval = interval
+        self._counters = Counter()
+        self._pending = Counter()
+        self._last_sink = monotonic()
+        self._lock = threading.Lock()
+
+    def incr(self, name, value=1):
+        """Increment a counter."""
+        self._add({name: value})
+        for hook in self.hooks:
+            hook("counter", name, value)
+
+    def observe(self, name, value):
+        """Record a value in a histogram."""
+        bucket = next((b for b in self.buckets if value <= b), "inf")
+        self._add(
+            {
+                f"{name}.count": 1,
+                f"{name}.sum": value,
+                f"{name}.bucket.{bucket}": 1,
+            }
+        )
+        for hook in self.hooks:
+            hook("histogram", name, value)
+
+    def snapshot(self):
+        """Return the values aggregated in this process."""
+        with self._lock:
+            return dict(self._counters)
+
+    def reset(self):
+        """Reset the values aggregated in this process."""
+        with self._lock:
+            self._counters.clear()
+            self._pending.clear()
+
+    def _add(self, values):
+        """Aggregate values and pass the pending ones to the sink if due."""
+        pending = None
+        with self._lock:
+            self._counters.update(values)
+            if self.sink is None:
+                return
+            self._pending.update(values)
+            now = monotonic()
+            if now - self._last_sink >= self.interval:
+                pending, self._pending = self._pending, Counter()
+                self._last_sink = now
+        if pending:
+            self.sink(dict(pending))
@@ -3,15 +3,36 @@
 
 """Implements a Redis cache."""
 
+import threading
+from time import monotonic
+
 from cachelib import RedisCache
 from flask import current_app
 from redis import StrictRedis
 
 from invenio_communities.cache.cache import IdentityCache
+from invenio_communities.cache.lru import LRUCache
+
+GET_SCRIPT = """
+local epoch = redis.call("GET", KEYS[1]) or "0"
+return redis.call("GET", ARGV[1] .. epoch .. ":" .. ARGV[2])
+"""
+"""Lua script reading a key of the current epoch in a single round-trip."""
 
 
 class IdentityRedisCache(IdentityCache):
-    """Redis image cache."""
+    """Redis image cache.
+
+    All keys are namespaced with an epoch stored in Redis. Flushing the cache
+    only increments the epoch, the keys of previous epochs are never read
+    again and expire on their own.
+
+    Metrics of all processes are aggregated in a Redis hash, which is updated
+    every ``COMMUNITIES_IDENTITIES_CACHE_METRICS_INTERVAL`` seconds.
+    """
+
+    delete_chunk_size = 1000
+    """Maximum number of keys deleted by a single command."""
 
     def __init__(self, app=None):
         """Initialize the cache."""
@@ -19,7 +40,56 @@ class IdentityRedisCache(IdentityCache):
         app = app or current_app
         redis_url = app.config["COMMUNITIES_IDENTITIES_CACHE_REDIS_URL"]
         prefix = app.config.get("COMMUNITIES_IDENTITIES_CACHE_REDIS_PREFIX", "identity")
-        self.cache = RedisCache(host=StrictRedis.from_url(redis_url), key_prefix=prefix)
+        self.redis = StrictRedis.from_url(redis_url)
+        self.cache = RedisCache(host=self.redis, key_prefix=prefix)
+        self._get_script = self.redis.register_script(GET_SCRIPT)
+        self.metrics.sink = self._publish_metrics
+        self.metrics.interval = app.config.get(
+            "COMMUNITIES_IDENTITIES_CACHE_METRICS_INTERVAL", 10
+        )
+
+    @property
+    def _epoch_key(self):
+        """Return the Redis key of the epoch."""
+        return f"{self.cache.key_prefix}epoch"
+
+    @property
+    def _stats_key(self):
+        """Return the Redis key of the metrics."""
+        return f"{self.cache.key_prefix}stats"
+
+    def _publish_metrics(self, values):
+        """Add the metrics of this process to the shared ones."""
+        with self.redis.pipeline(transaction=False) as pipe:
+            for name, value in values.items():
+                pipe.hincrbyfloat(self._stats_key, name, value)
+            pipe.execute()
+
+    def stats(self):
+        """Return the metrics of all processes.
+
+        Metrics not yet published by the other processes are not included.
+        """
+        return {
+            k.decode("utf-8"): float(v)
+            for k, v in self.redis.hgetall(self._stats_key).items()
+        }
+
+    def epoch(self):
+        """Return the current epoch."""
+        return int(self.redis.get(self._epoch_key) or 0)
+
+    def _key(self, key, epoch):
+        """Return the key namespaced with the epoch."""
+        return f"{epoch}:{key}"
+
+    def _redis_key(self, key, epoch):
+        """Return the prefixed Redis key namespaced with the epoch."""
+        return f"{self.cache.key_prefix}{self._key(key, epoch)}"
+
+    def _values_key(self, key, epoch):
+        """Return the prefixed Redis key of a set namespaced with the epoch."""
+        return self._redis_key(f"values:{key}", epoch)
 
     def get(self, key):
         """Return the key value.
@@ -27,7 +97,16 @@ class IdentityRedisCache(IdentityCache):
         :param key: the object's key
         :return: the stored object
         """
-        return self.cache.get(key)
+        value = self._get_script(
+            keys=[self._epoch_key], args=[self.cache.key_prefix, key]
+        )
+        self.metrics.incr("gets")
+        if value is None:
+            self.metrics.incr("misses")
+            return None
+        self.metrics.incr("hits")
+        self.metrics.incr("payload_bytes.read", len(value))
+        return self.cache.serializer.loads(value)
 
     def set(self, key, value, timeout=None):
         """Cache the object.
@@ -36,33 +115,249 @@ class IdentityRedisCache(IdentityCache):
         :param value: the stored object
         :param timeout: the cache timeout in seconds
         """
+        self.set_many({key: value}, timeout=timeout)
+
+    def set_many(self, mapping, timeout=None):
+        """Cache several objects in a single pipeline.
+
+        :param mapping: a dict of keys and objects to store
+        :param timeout: the cache timeout in seconds
+        """
         timeout = timeout or self.timeout
-        self.cache.set(key, value, timeout=timeout)
+        epoch = self.epoch()
+        size = 0
+        with self.redis.pipeline(transaction=False) as pipe:
+            for key, value in mapping.items():
+                value = self.cache.serializer.dumps(value)
+                size += len(value)
+                pipe.setex(self._redis_key(key, epoch), timeout, value)
+            pipe.execute()
+        self.metrics.incr("sets", len(mapping))
+        self.metrics.incr("payload_bytes.written", size)
 
     def delete(self, key):
         """Delete the specific key."""
-        self.cache.delete(key)
+        self.delete_many([key])
 
     def flush(self):
-        """Flush the cache."""
-        self.cache.clear()
+        """Flush the cache by moving to a new epoch."""
+        self.redis.incr(self._epoch_key)
+        self.metrics.incr("flushes")
+
+    def delete_many(self, keys):
+        """Delete the specific keys in a single pipeline."""
+        keys = list(keys)
+        if not keys:
+            return
+        epoch = self.epoch()
+        keys = [self._redis_key(key, epoch) for key in keys]
+        with self.redis.pipeline(transaction=False) as pipe:
+            for i in range(0, len(keys), self.delete_chunk_size):
+                pipe.delete(*keys[i : i + self.delete_chunk_size])
+            pipe.execute()
+        self.metrics.incr("deletes", len(keys))
 
     def append(self, key, value):
-        """Appends a new value to a list.
+        """Add a value to the set stored under the key.
+
+        The set is stored as a native Redis set, so that concurrent appends
+        are not lost and the set does not need to be loaded.
+
+        :param key: the set's key
+        :param value: the value to add
+        """
+        self.append_many([key], value)
+
+    def append_many(self, keys, value):
+        """Add a value to the sets stored under each of the keys.
+
+        All sets are updated in a single pipeline.
+        """
+        self.append_values({key: [value] for key in keys})
+
+    def append_values(self, mapping):
+        """Add values to the sets stored under each of the keys.
+
+        All sets are updated in a single pipeline.
+
+        :param mapping: a dict of keys and iterables of values to add
+        """
+        epoch = self.epoch()
+        count = 0
+        with self.redis.pipeline(transaction=False) as pipe:
+            for key, values in mapping.items():
+                values = list(values)
+                if not values:
+                    continue
+                count += len(values)
+                values_key = self._values_key(key, epoch)
+                pipe.sadd(values_key, *values)
+                pipe.expire(values_key, self.timeout)
+            pipe.execute()
+        self.metrics.incr("appends", count)
+
+    def values(self, key):
+        """Return the values of the set stored under the key."""
+        values_key = self._values_key(key, self.epoch())
+        return [v.decode("utf-8") for v in self.redis.smembers(values_key)]
+
+
+class IdentityTieredRedisCache(IdentityRedisCache):
+    """Redis cache fronted by a per-worker in-process LRU.
+
+    Only keys starting with ``COMMUNITIES_IDENTITIES_CACHE_LOCAL_KEY_PREFIX``
+    (i.e. the per-user community roles) are kept in the local tier. Other
+    keys, such as the community to identities index, are always read from
+    Redis.
+
+    Deleted keys are appended to an invalidation log in Redis. Each worker
+    syncs with the log at most every
+    ``COMMUNITIES_IDENTITIES_CACHE_LOCAL_SYNC_INTERVAL`` seconds, and only
+    drops the deleted keys from its local tier. A local hit between two syncs
+    costs no network round-trip, at the price of serving an entry deleted by
+    another worker for up to the sync interval. A flush, or a worker which
+    fell behind the log, clears the whole local tier.
+    """
+
+    invalidations_log_size = 10000
+    """Maximum number of deleted keys kept in the invalidation log."""
+
+    def __init__(self, app=None):
+        """Initialize the cache."""
+        super().__init__(app=app)
+        app = app or current_app
+        self.local = LRUCache(
+            maxsize=app.config["COMMUNITIES_IDENTITIES_CACHE_LOCAL_MAXSIZE"],
+            timeout=app.config["COMMUNITIES_IDENTITIES_CACHE_LOCAL_TIME"],
+        )
+        self.local_key_prefix = app.config[
+            "COMMUNITIES_IDENTITIES_CACHE_LOCAL_KEY_PREFIX"
+        ]
+        self.sync_interval = app.config.get(
+            "COMMUNITIES_IDENTITIES_CACHE_LOCAL_SYNC_INTERVAL", 1
+        )
+        self._synced = None
+        self._synced_at = None
+        self._sync_lock = threading.Lock()
+
+    @property
+    def _version_key(self):
+        """Return the Redis key of the invalidation log version."""
+        return f"{self.cache.key_prefix}version"
+
+    @property
+    def _invalidations_key(self):
+        """Return the Redis key of the invalidation log."""
+        return f"{self.cache.key_prefix}invalidations"
+
+    def _is_local(self, key):
+        """Determine if the key is kept in the local tier."""
+        return key.startswith(self.local_key_prefix)
+
+    def sync(self, force=False):
+        """Drop the local entries deleted or flushed by any worker.
+
+        :param force: if False, only sync if the last sync is older than the
+            sync interval.
+        """
+        with self._sync_lock:
+            now = monotonic()
+            if (
+                not force
+                and self._synced_at is not None
+                and now - self._synced_at < self.sync_interval
+            ):
+                return
+            self._synced_at = now
+            epoch, version = self.redis.mget(self._epoch_key, self._version_key)
+            synced = (int(epoch or 0), int(version or 0))
+            if synced == self._synced:
+                return
+            if (
+                self._synced is None
+                or synced[0] != self._synced[0]
+                or synced[1] - self._synced[1] > self.invalidations_log_size
+            ):
+                self.local.clear()
+            else:
+                for key in self.redis.zrangebyscore(
+                    self._invalidations_key, self._synced[1] + 1, synced[1]
+                ):
+                    self.local.delete(key.decode("utf-8"))
+            self._synced = synced
+
+    def get(self, key):
+        """Return the key value.
+
+        :param key: the object's key
+        :return: the stored object
+        """
+        if not self._is_local(key):
+            return super().get(key)
+
+        self.sync()
+        value = self.local.get(key)
+        if value is not None:
+            self.metrics.incr("local_hits")
+            return value
+
+        self.metrics.incr("local_misses")
+        version, synced = self.local.version, self._synced
+        value = super().get(key)
+        # A value read before a sync may have been deleted since.
+        if value is not None and self._synced == synced:
+            self.local.set(key, value, version=version)
+        return value
+
+    def set(self, key, value, timeout=None):
+        """Cache the object.
 
         :param key: the object's key
-        :param value: the stored list
+        :param value: the stored object
+        :param timeout: the cache timeout in seconds
         """
-        values_list = self.cache.get(key)
-        if values_list:
-            if not isinstance(values_list, list):
-                raise TypeError(
-                    "Value {value} must be a list but was {type}".format(
-                        value=values_list, type=type(values_list)
-                    )
-                )
-            if value not in values_list:
-                values_list.append(value)
-        else:
-            values_list = [value]
-        self.set(key, values_list)
+        super().set_many({key: value}, timeout=timeout)
+        if self._is_local(key):
+            self.local.set(key, value, timeout=timeout)
+
+    def set_many(self, mapping, timeout=None):
+        """Cache several objects.
+
+        :param mapping: a dict of keys and objects to store
+        :param timeout: the cache timeout in seconds
+        """
+        super().set_many(mapping, timeout=timeout)
+        for key in mapping:
+            self.local.delete(key)
+
+    def delete_many(self, keys):
+        """Delete the specific keys from both tiers of all workers."""
+        keys = list(keys)
+        if not keys:
+            return
+        for key in keys:
+            self.local.delete(key)
+        super().delete_many(keys)
+
+        local_keys = [key for key in keys if self._is_local(key)]
+        if not local_keys:
+            return
+        # Each key gets its own version, so that the log size is a number of
+        # versions. The keys are logged after their deletion, so that a value
+        # read before it is dropped by the next sync.
+        version = self.redis.incrby(self._version_key, len(local_keys))
+        first = version - len(local_keys) + 1
+        with self.redis.pipeline(transaction=False) as pipe:
+            pipe.zadd(
+                self._invalidations_key,
+                {key: first + i for i, key in enumerate(local_keys)},
+            )
+            pipe.zremrangebyrank(
+                self._invalidations_key, 0, -self.invalidations_log_size - 1
+            )
+            pipe.execute()
+
+    def flush(self):
+        """Flush both tiers of all workers."""
+        self.local.clear()
+        super().flush()
@@ -3,6 +3,8 @@
 
 """Command-line tools for demo module."""
 
+from datetime import datetime, timedelta, timezone
+
 import click
 from faker import Faker
 from flask import current_app
@@ -23,6 +25,7 @@ from invenio_search.utils import build_alias_name
 from .fixtures.demo import create_fake_community
 from .fixtures.tasks import create_demo_community
 from .proxies import current_communities, current_identities_cache
+from .utils import chunked_user_ids, warm_identities_cache
 
 
 @click.group()
@@ -44,6 +47,51 @@ def clear():
     click.secho("Identity cache cleared.", fg="green")
 
 
+@identity_cache.command("stats")
+@with_appcontext
+def stats():
+    """Shows identity cache statistics."""
+    stats = current_identities_cache.stats()
+    for name, value in sorted(stats.items()):
+        click.echo(f"{name}: {value:g}")
+    lookups = stats.get("gets", 0) + stats.get("local_hits", 0)
+    if lookups:
+        hits = stats.get("hits", 0) + stats.get("local_hits", 0)
+        click.secho(f"Hit ratio: {hits / lookups:.2%}", fg="green")
+
+
+@identity_cache.command("warm")
+@click.option(
+    "-d",
+    "--days",
+    type=int,
+    required=False,
+    help="Only warm users who logged in during the last days (default: all users).",
+)
+@click.option(
+    "-c",
+    "--chunk-size",
+    type=int,
+    required=False,
+    help="Number of users per chunk.",
+)
+@with_appcontext
+def warm(days, chunk_size):
+    """Pre-populates identity cache."""
+    click.secho("Warming identity cache...", fg="green")
+    active_since = None
+    if days is not None:
+        active_since = datetime.now(timezone.utc) - timedelta(days=days)
+    chunk_size = (
+        chunk_size or current_app.config["COMMUNITIES_IDENTITIES_CACHE_WARM_CHUNK_SIZE"]
+    )
+    total = 0
+    for user_ids in chunked_user_ids(chunk_size, active_since=active_since):
+        total += warm_identities_cache(user_ids)
+        click.echo(f"Warmed {total} users.")
+    click.secho("Identity cache warmed.", fg="green")
+
+
 @communities.command("demo")
 @with_appcontext
 def demo():
@@ -69,6 +117,39 @@ def rebuild_index():
     click.secho("Reindexed communities!", fg="green")
 
 
+@communities.command("rebuild-members-index")
+@click.option(
+    "-c",
+    "--community-id",
+    type=click.UUID,
+    required=False,
+    help="Only reindex the members of this community (default: all communities).",
+)
+@click.option(
+    "-s",
+    "--chunk-size",
+    type=int,
+    required=False,
+    help="Number of members per chunk.",
+)
+@with_appcontext
+def rebuild_members_index(community_id, chunk_size):
+    """Rebuild the members indices."""
+    click.secho("Reindexing members...", fg="green")
+
+    def progress(name, count):
+        click.echo(f"Sent {count} {name} records to the indexer.")
+
+    current_communities.service.members.rebuild_index(
+        system_identity,
+        community_id=community_id,
+        chunk_size=chunk_size,
+        progress=progress,
+    )
+
+    click.secho("Reindexed members!", fg="green")
+
+
 @communities.group()
 def custom_fields():
     """Communities custom fields commands."""
@@ -0,0 +1,54 @@
+# SPDX-FileCopyrightText: 2026 CERN.
+# SPDX-License-Identifier: MIT
+
+"""Member principals dumper.
+
+Dumper used to dump the principals (users and groups) having a role in a
+community to a search body, so that permission filters can match on the
+principals of an identity instead of on its communities.
+"""
+
+from flask import current_app
+from invenio_records.dumpers import SearchDumperExt
+
+
+def member_principal(role, member_type, member_id):
+    """Get the dumped value of a member principal."""
+    return f"{role}:{member_type}:{member_id}"
+
+
+class MemberPrincipalsDumperExt(SearchDumperExt):
+    """Dumper for the member principals field."""
+
+    def __init__(self, key="member_principals"):
+        """Initialize the dumper."""
+        self.key = key
+
+    def dump(self, record, data):
+        """Dump the principals of the active members.
+
+        The principals are only dumped if ``COMMUNITIES_MEMBER_PRINCIPALS_FILTER``
+        is enabled, as they are only used by its query filters.
+        """
+        if not current_app.config["COMMUNITIES_MEMBER_PRINCIPALS_FILTER"]:
+            return
+        # Imported here to avoid a circular import through the members package
+        from invenio_communities.members.records.models import MemberModel
+
+        members = MemberModel.query.filter(
+            MemberModel.community_id == record.id,
+            MemberModel.active.is_(True),
+        ).with_entities(MemberModel.user_id, MemberModel.group_id, MemberModel.role)
+
+        data[self.key] = sorted(
+            (
+                member_principal(role, "user", user_id)
+                if user_id is not None
+                else member_principal(role, "group", group_id)
+            )
+            for user_id, group_id, role in members
+        )
+
+    def load(self, data, record_cls):
+        """Load (remove) indexed data."""
+        data.pop(self.key, None)
@@ -16,7 +16,7 @@ from invenio_records_resources.references.entity_resolvers import (
     RecordResolver,
 )
 
-from ..generators import CommunityRoleNeed
+from ..generators import CommunityRoleNeed, resolve_lazy_needs
 from ..proxies import current_communities, current_roles
 from .records.api import Community
 from .schema import CommunityGhostSchema
@@ -66,8 +66,9 @@ class CommunityPKProxy(RecordPKProxy):
     def get_needs(self, ctx=None):
         """Return community member need."""
         ctx = ctx or {}
-        roles = ctx.get("community_roles", [role.name for role in current_roles])
+        roles = ctx.get("community_roles", current_roles.names)
         comid = str(self._parse_ref_dict_id())
+        resolve_lazy_needs([comid])
         return [CommunityRoleNeed(comid, role) for role in roles]
 
     def pick_resolved_fields(self, identity, resolved_dict):
@@ -28,6 +28,7 @@ from invenio_communities.communities.records.systemfields.is_verified import (
 )
 
 from ..dumpers.featured import FeaturedDumperExt
+from ..dumpers.principals import MemberPrincipalsDumperExt
 from . import models
 from .systemfields.access import CommunityAccessField
 from .systemfields.deletion_status import CommunityDeletionStatusField
@@ -59,11 +60,12 @@ class Community(Record):
     dumper = SearchDumper(
         extensions=[
             FeaturedDumperExt("featured"),
+            MemberPrincipalsDumperExt("member_principals"),
             RelationDumperExt("relations"),
         ]
     )
 
-    index = IndexField("communities-communities-v2.0.0", search_alias="communities")
+    index = IndexField("communities-communities-v2.1.0", search_alias="communities")
 
     access = CommunityAccessField()
 
@@ -21,6 +21,7 @@ from marshmallow_utils.fields import FormatEDTF as FormatEDTF_
 
 from invenio_communities.communities.schema import CommunityThemeSchema
 from invenio_communities.proxies import current_communities
+from invenio_communities.utils import check_community_permission
 
 
 def _community_permission_check(action, community, identity):
@@ -34,11 +35,16 @@ def _community_permission_check(action, community, identity):
             community["processed"][0]["community_id"],
         )
 
-    return current_communities.service.config.permission_policy_cls(
+    return check_community_permission(
+        identity,
         action,
-        community_id=community_id,
-        record=community,
-    ).allows(identity)
+        community=community,
+        evaluate=lambda: current_communities.service.config.permission_policy_cls(
+            action,
+            community_id=community_id,
+            record=community,
+        ).allows(identity),
+    )
 
 
 def mask_removed_by(obj):
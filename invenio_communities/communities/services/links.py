@@ -3,11 +3,22 @@
 
 """Utility for rendering URI template links."""
 
+from collections import namedtuple
+
 from invenio_records_resources.services.base.links import (
     EndpointLink,
     LinksTemplate,
 )
 
+from ...generators import (
+    CommunityRoleNeed,
+    community_access_profile,
+    resolve_community_needs,
+)
+from ...permissions import can_perform_action, uses_default_permissions
+
+_PolicyNeeds = namedtuple("PolicyNeeds", ["needs", "excludes"])
+
 
 class CommunityLinksTemplate(LinksTemplate):
     """Templates for generating links for a community object."""
@@ -18,9 +29,17 @@ class CommunityLinksTemplate(LinksTemplate):
         self._action_link = action_link
         self._available_actions = available_actions
 
-    def expand(self, identity, community):
-        """Expand all the link templates."""
+    def expand(self, identity, community, decisions=None):
+        """Expand all the link templates.
+
+        :param decisions: a dict shared between the expansions of several
+            communities, in which the action permissions are evaluated once per
+            community profile (see ``expand_many``). It is ignored if the
+            decisions cannot be shared (see ``shares_decisions``).
+        """
         links = {}
+        if decisions is not None and not self.shares_decisions():
+            decisions = None
 
         # expand links for all available actions on the request
         link = self._action_link
@@ -29,7 +48,11 @@ class CommunityLinksTemplate(LinksTemplate):
             ctx["action_name"] = action["action_name"]
             ctx["action"] = action["action_permission"]
             ctx["identity"] = identity
-            if link.should_render(community, ctx):
+            if decisions is None:
+                allowed = link.should_render(community, ctx)
+            else:
+                allowed = self._allows(identity, community, ctx["action"], decisions)
+            if allowed:
                 links[action["action_name"]] = link.expand(community, ctx)
 
         # expand the other configured links
@@ -41,10 +64,65 @@ class CommunityLinksTemplate(LinksTemplate):
 
         return links
 
+    def expand_many(self, identity, communities):
+        """Expand all the link templates of several communities.
+
+        The permission policy of each available action is evaluated once per
+        distinct community profile (access policies and deletion status). The
+        needs of the other communities with the same profile are derived by
+        replacing the community of their community role needs.
+
+        The decisions are only shared if the action link is rendered with
+        ``can_perform_action``, and if the permission policy uses the default
+        permissions. Otherwise the links of each community are expanded on
+        their own.
+        """
+        decisions = {}
+        return [self.expand(identity, c, decisions=decisions) for c in communities]
+
+    def shares_decisions(self):
+        """Determine if the action decisions can be shared by a profile."""
+        when = getattr(self._action_link, "when", None)
+        policy_cls = self.context["permission_policy_cls"]
+        return when is can_perform_action and uses_default_permissions(policy_cls)
+
+    def _allows(self, identity, community, action, decisions):
+        """Check an action permission, reusing the needs of the same profile."""
+        profile = community_access_profile(community)
+        key = (action, profile if profile is not None else str(community.id))
+        if key not in decisions:
+            permission = self.context["permission_policy_cls"](
+                action, community=community
+            )
+            decisions[key] = (str(community.id), permission.needs, permission.excludes)
+        source_id, needs, excludes = decisions[key]
+
+        community_id = str(community.id)
+        if community_id != source_id:
+            needs = {_retarget(n, source_id, community_id) for n in needs}
+            excludes = {_retarget(n, source_id, community_id) for n in excludes}
+
+        resolve_community_needs(identity, _PolicyNeeds(needs, excludes))
+        if needs and not needs & identity.provides:
+            return False
+        return not excludes & identity.provides
+
+
+def _retarget(need, source_id, community_id):
+    """Replace the community of a community role need."""
+    if need.method == "community" and need.value == source_id:
+        return CommunityRoleNeed(community_id, need.role)
+    return need
+
 
 class CommunityEndpointLink(EndpointLink):
     """Rendering of community API link with relevant variables expansion."""
 
+    def __init__(self, endpoint, when=None, **kwargs):
+        """Constructor."""
+        super().__init__(endpoint, when=when, **kwargs)
+        self.when = when
+
     @staticmethod
     def vars(record, vars):
         """Variables for generation of the url."""
@@ -3,8 +3,13 @@
 
 """Result items for OAI-PMH services."""
 
+from functools import partial
+
 from invenio_records_resources.services.records.results import RecordItem, RecordList
 
+from ...utils import check_community_permission
+from .links import CommunityLinksTemplate
+
 
 class CommunityListResult(RecordList):
     """List of result items."""
@@ -37,9 +42,18 @@ class CommunityListResult(RecordList):
         self._links_item_tpl = links_item_tpl
         self._expand = expand
 
+    def _expand_links(self, record, decisions):
+        """Expand the links of a record, sharing the permission decisions."""
+        if isinstance(self._links_item_tpl, CommunityLinksTemplate):
+            return self._links_item_tpl.expand(
+                self._identity, record, decisions=decisions
+            )
+        return self._links_item_tpl.expand(self._identity, record)
+
     @property
     def hits(self):
         """Iterator over the hits."""
+        decisions = {}
         for hit in self._results:
             # Load dump
             record = self._service.record_cls.loads(hit.to_dict())
@@ -57,9 +71,7 @@ class CommunityListResult(RecordList):
                 ),
             )
             if self._links_item_tpl:
-                projection["links"] = self._links_item_tpl.expand(
-                    self._identity, record
-                )
+                projection["links"] = self._expand_links(record, decisions)
 
             yield projection
 
@@ -83,6 +95,7 @@ class CommunityFeaturedList(CommunityListResult):
     @property
     def hits(self):
         """Iterator over the hits."""
+        decisions = {}
         for record in self._results.items:
             # Project the record
             projection = self._schema.dump(
@@ -93,9 +106,7 @@ class CommunityFeaturedList(CommunityListResult):
                 ),
             )
             if self._links_item_tpl:
-                projection["links"] = self._links_item_tpl.expand(
-                    self._identity, record
-                )
+                projection["links"] = self._expand_links(record, decisions)
 
             yield projection
 
@@ -107,6 +118,26 @@ class CommunityItem(RecordItem):
     to remove though.
     """
 
+    def has_permissions_to(self, actions):
+        """Returns dict of "can_<action>": bool.
+
+        Decisions are memoized for the current request.
+        """
+        return {
+            f"can_{action}": check_community_permission(
+                self._identity,
+                action,
+                community=self._record,
+                evaluate=partial(
+                    self._service.check_permission,
+                    self._identity,
+                    action,
+                    record=self._record,
+                ),
+            )
+            for action in actions
+        }
+
 
 class FeaturedCommunityItem(CommunityItem):
     """Single Featured Community result."""
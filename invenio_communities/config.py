@@ -231,6 +231,25 @@ COMMUNITIES_INVITATIONS_SORT_OPTIONS = {
 COMMUNITIES_INVITATIONS_EXPIRES_IN = timedelta(days=30)
 """Default amount of time before an invitation expires."""
 
+COMMUNITIES_MEMBERS_IMPORT_CHUNK_SIZE = 100
+"""Number of entries of a members import added/invited at once.
+
+It cannot exceed the maximum number of members of a bulk add/invite.
+"""
+
+COMMUNITIES_MEMBERS_IMPORT_MAX_RETRIES = 16
+"""Maximum number of retries of the sub-chunks of a rejected import chunk.
+
+A rejected chunk is split in halves to isolate its rejected entries. Once the
+retries are exhausted, the remaining entries fail with the chunk's error.
+"""
+
+COMMUNITIES_MEMBERS_IMPORT_MAX_ENTRIES = 50000
+"""Maximum number of entries of a single members import."""
+
+COMMUNITIES_MEMBERS_REINDEX_CHUNK_SIZE = 1000
+"""Number of members per chunk when rebuilding the members indices."""
+
 COMMUNITIES_MEMBERSHIP_REQUESTS_SEARCH = {
     "facets": ["role", "status"],
     "sort": ["bestmatch", "name", "newest", "oldest"],
@@ -353,10 +372,88 @@ COMMUNITIES_IDENTITIES_CACHE_TIME = 60 * 60 * 24
 COMMUNITIES_IDENTITIES_CACHE_REDIS_URL = "redis://localhost:6379/4"
 
 # Cache handler
+# Use "invenio_communities.cache.memory:IdentityMemoryCache" to keep the cache
+# in-process (e.g. single-process deployments and tests).
 COMMUNITIES_IDENTITIES_CACHE_HANDLER = (
     "invenio_communities.cache.redis:IdentityRedisCache"
 )
 
+COMMUNITIES_MEMBER_PRINCIPALS_FILTER = False
+"""Filter communities searches on the member principals indexed on communities.
+
+Instead of a query on the ids of all communities of the identity, searches
+match the user and group ids of the identity against the principals of the
+members indexed on each community. The principals are only indexed (and
+communities only reindexed on membership changes) while it is enabled, hence
+communities must be reindexed after it is enabled.
+"""
+
+COMMUNITIES_IDENTITIES_LAZY_NEEDS = False
+"""Resolve the community needs of an identity on demand.
+
+Instead of adding all community needs when the identity is loaded, they are
+added once a permission of the communities service checks them, and only for
+the checked communities. Search filters load all of them. Permission policies
+of other modules checking community needs must first call
+``invenio_communities.generators.resolve_community_needs``.
+"""
+
+COMMUNITIES_IDENTITIES_CACHE_LOCAL_TIME = 60
+"""Lifetime in seconds of the per-worker entries of the tiered identity cache.
+
+Only used by ``invenio_communities.cache.redis:IdentityTieredRedisCache``.
+"""
+
+COMMUNITIES_IDENTITIES_CACHE_LOCAL_SYNC_INTERVAL = 1
+"""Interval in seconds between two syncs of the tiered identity cache.
+
+Only used by ``invenio_communities.cache.redis:IdentityTieredRedisCache``. A
+worker syncs its local tier with the keys deleted by other workers at most this
+often, so it bounds how long such a deletion can go unnoticed. Local hits
+between two syncs cost no network round-trip.
+"""
+
+COMMUNITIES_IDENTITIES_CACHE_LOCAL_MAXSIZE = 10000
+"""Maximum number of per-worker entries of the tiered identity cache."""
+
+COMMUNITIES_IDENTITIES_CACHE_LOCAL_KEY_PREFIX = "user-communities:"
+"""Prefix of the keys kept in the per-worker tier of the tiered identity cache."""
+
+COMMUNITIES_IDENTITIES_CACHE_MEMORY_MAXSIZE = 100000
+"""Maximum number of entries of the in-memory identity cache.
+
+Only used by ``invenio_communities.cache.memory:IdentityMemoryCache``.
+"""
+
+COMMUNITIES_IDENTITIES_CACHE_MEMORY_MAXBYTES = 64 * 1024 * 1024
+"""Maximum size in bytes of the values of the in-memory identity cache."""
+
+COMMUNITIES_IDENTITIES_CACHE_COMPACT_ROLES = False
+"""Store the cached community roles of a user in a compact binary encoding.
+
+This reduces the size of the cached entries by about 60%, at the cost of a
+slower decoding than unpickling. Entries in either format are read.
+"""
+
+COMMUNITIES_IDENTITIES_CACHE_WARM_CHUNK_SIZE = 1000
+"""Number of users per chunk when pre-populating the identity cache."""
+
+COMMUNITIES_IDENTITIES_CACHE_ASYNC_INVALIDATION_THRESHOLD = 1000
+"""Number of users above which a datastore commit clears their cache in a task.
+
+Set to ``None`` to always clear the cache synchronously.
+"""
+
+COMMUNITIES_IDENTITIES_CACHE_METRICS_HOOKS = []
+"""Callables (or import strings) receiving the identity cache metrics.
+
+Each hook is called with the kind of metric (``"counter"`` or
+``"histogram"``), its name and the recorded value.
+"""
+
+COMMUNITIES_IDENTITIES_CACHE_METRICS_INTERVAL = 10
+"""Interval in seconds at which a process shares its identity cache metrics."""
+
 COMMUNITIES_OAI_SETS_PREFIX = "community-"
 
 COMMUNITIES_ALWAYS_SHOW_CREATE_LINK = False
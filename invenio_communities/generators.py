@@ -11,13 +11,22 @@ from collections import namedtuple
 from functools import partial, reduce
 from itertools import chain
 
-from flask import current_app
+from flask import current_app, g, has_app_context
 from flask_principal import UserNeed
 from invenio_access.permissions import any_user, authenticated_user, system_process
 from invenio_records.dictutils import dict_lookup
-from invenio_records_permissions.generators import ConditionalGenerator, Generator
+from invenio_records_permissions.generators import (
+    AnyUser,
+    AuthenticatedUser,
+    ConditionalGenerator,
+    Disable,
+    Generator,
+    SameAs,
+    SystemProcess,
+)
 from invenio_search.engine import dsl
 
+from .communities.dumpers.principals import member_principal
 from .communities.records.systemfields.deletion_status import (
     CommunityDeletionStatusEnum,
 )
@@ -41,6 +50,110 @@ You can create a community role need like below:
     assert need.role == 'manager
 """
 
+LAZY_IDENTITIES_KEY = "communities_lazy_identities"
+"""Key of the identities with lazily resolved community needs in ``g``."""
+
+
+class CommunityNeedsIndex:
+    """Index of the community role needs provided by an identity.
+
+    It maps community ids to roles and roles to community ids, so that checks
+    on the community memberships of an identity don't scan all its needs.
+    """
+
+    def __init__(self, needs=()):
+        """Constructor."""
+        self.size = 0
+        self.roles_by_community = {}
+        self.communities_by_role = {}
+        for need in needs:
+            if need.method == "community":
+                self.add(need.value, need.role)
+
+    @classmethod
+    def from_identity(cls, identity):
+        """Build the index of an identity."""
+        index = cls(identity.provides)
+        index.size = len(identity.provides)
+        return index
+
+    def add(self, community_id, role):
+        """Add a community role to the index."""
+        self.roles_by_community.setdefault(community_id, set()).add(role)
+        self.communities_by_role.setdefault(role, set()).add(community_id)
+
+    def communities(self, role=None):
+        """Get the ids of the communities where the identity has a role."""
+        if role is None:
+            return list(self.roles_by_community)
+        return list(self.communities_by_role.get(role, ()))
+
+    def has_role(self, community_id, role):
+        """Determine if the identity has a role in a community."""
+        return role in self.roles_by_community.get(community_id, ())
+
+
+def community_needs_index(identity):
+    """Get the community needs index of an identity.
+
+    The index attached to the identity is rebuilt if needs were added to or
+    removed from the identity after it was built. Lazily resolved community
+    needs are all loaded first.
+    """
+    resolver = getattr(identity, "community_needs_resolver", None)
+    if resolver is not None:
+        resolver.load_all(identity)
+    index = getattr(identity, "community_needs", None)
+    if index is None or index.size != len(identity.provides):
+        index = CommunityNeedsIndex.from_identity(identity)
+        identity.community_needs = index
+    return index
+
+
+def identity_principals(identity):
+    """Get the principals (user and groups) of an identity.
+
+    :return: list of (member type, member id) pairs.
+    """
+    if identity is None:
+        return []
+    principals = [("group", n.value) for n in identity.provides if n.method == "role"]
+    if identity.id is not None:
+        principals.append(("user", identity.id))
+    return principals
+
+
+def resolve_community_needs(identity, permission):
+    """Load the lazily resolved community needs checked by a permission.
+
+    Only the needs of the communities referenced by the needs and excludes of
+    the permission are added to the identity. It does nothing if the
+    community needs of the identity were loaded eagerly.
+    """
+    resolver = getattr(identity, "community_needs_resolver", None)
+    if resolver is None:
+        return
+    community_ids = {
+        n.value
+        for n in chain(permission.needs, permission.excludes)
+        if n.method == "community"
+    }
+    if community_ids:
+        resolver.load(identity, community_ids)
+
+
+def resolve_lazy_needs(community_ids):
+    """Resolve the needs of communities for the lazy identities of the context.
+
+    Called wherever community needs are generated (community generators and
+    entity proxies), so that any permission policy checking them, e.g. the
+    requests policies, sees the needs of the identity.
+    """
+    if not has_app_context():
+        return
+    for identity in g.get(LAZY_IDENTITIES_KEY, ()):
+        identity.community_needs_resolver.load(identity, community_ids)
+
 
 # TODO: Move class to Invenio-Records-Permissions and make more reusable
 class IfRestrictedBase(Generator):
@@ -90,11 +203,16 @@ class IfRestrictedBase(Generator):
         queries = [q for q in queries if q]
         return reduce(operator.or_, queries) if queries else None
 
+    def query_conditions(self):
+        """Queries matching the records of the "then" and "else" branches."""
+        return (
+            dsl.Q("match", **{self.field_name: self.then_value}),
+            dsl.Q("match", **{self.field_name: self.else_value}),
+        )
+
     def query_filter(self, **kwargs):
         """Filters for current identity."""
-        # TODO: Next two statement should be made more reusable
-        q_then = dsl.Q("match", **{self.field_name: self.then_value})
-        q_else = dsl.Q("match", **{self.field_name: self.else_value})
+        q_then, q_else = self.query_conditions()
         then_query = self.make_query(self.then_, **kwargs)
         else_query = self.make_query(self.else_, **kwargs)
 
@@ -217,12 +335,19 @@ class IfCommunityDeleted(Generator):
         queries = [q for q in queries if q]
         return reduce(operator.or_, queries) if queries else None
 
+    def query_conditions(self):
+        """Queries matching the records of the "then" and "else" branches."""
+        return (
+            dsl.Q("match_all"),
+            dsl.Q(
+                "term",
+                **{"deletion_status": CommunityDeletionStatusEnum.PUBLISHED.value},
+            ),
+        )
+
     def query_filter(self, **kwargs):
         """Filters for current identity."""
-        q_then = dsl.Q("match_all")
-        q_else = dsl.Q(
-            "term", **{"deletion_status": CommunityDeletionStatusEnum.PUBLISHED.value}
-        )
+        q_then, q_else = self.query_conditions()
         then_query = self.make_query(self.then_, **kwargs)
         else_query = self.make_query(self.else_, **kwargs)
 
@@ -279,7 +404,7 @@ class AuthenticatedUserButNotCommunityMember(Generator):
         if not record:
             return []
         community_id = str(record.id)
-        return [CommunityRoleNeed(community_id, r.name) for r in current_roles]
+        return [CommunityRoleNeed(community_id, name) for name in current_roles.names]
 
 
 class CommunityRoles(Generator):
@@ -300,11 +425,20 @@ class CommunityRoles(Generator):
 
         assert community_id, "No community id provided."
         community_id = str(community_id)
+        resolve_lazy_needs([community_id])
 
         return [CommunityRoleNeed(community_id, r) for r in self.roles(**kwargs) or []]
 
     def query_filter(self, identity=None, **kwargs):
         """Filters for current identity as owner."""
+        if current_app.config["COMMUNITIES_MEMBER_PRINCIPALS_FILTER"]:
+            # Match the principals of the identity on the indexed members.
+            principals = [
+                member_principal(role, member_type, member_id)
+                for role in self.roles(**kwargs)
+                for member_type, member_id in identity_principals(identity)
+            ]
+            return dsl.Q("terms", member_principals=principals)
         # Gives access to all community members.
         return dsl.Q("terms", **{"_id": self.communities(identity)})
 
@@ -314,11 +448,11 @@ class CommunityMembers(CommunityRoles):
 
     def roles(self, **kwargs):
         """Roles."""
-        return [r.name for r in current_roles]
+        return current_roles.names
 
     def communities(self, identity):
         """Communities."""
-        return [n.value for n in identity.provides if n.method == "community"]
+        return community_needs_index(identity).communities()
 
 
 class CommunityCurators(CommunityRoles):
@@ -326,7 +460,7 @@ class CommunityCurators(CommunityRoles):
 
     def roles(self, **kwargs):
         """Roles."""
-        return [r.name for r in current_roles.can("curate")]
+        return current_roles.names_can("curate")
 
 
 class CommunityManagers(CommunityRoles):
@@ -334,7 +468,7 @@ class CommunityManagers(CommunityRoles):
 
     def roles(self, **kwargs):
         """Roles."""
-        return [r.name for r in current_roles.can("manage")]
+        return current_roles.names_can("manage")
 
 
 class CommunityManagersForRole(CommunityRoles):
@@ -342,25 +476,25 @@ class CommunityManagersForRole(CommunityRoles):
 
     def roles(self, role=None, member=None, **kwargs):
         """Roles."""
-        allowed_roles = []
         if role is not None and member is not None:
             # Update from an old role to a new role. The most restrictive set
             # applies.
-            new_allowed_roles = set(current_roles.manager_roles(role))
-            old_allowed_roles = set(current_roles.manager_roles(member.role))
-            allowed_roles = new_allowed_roles & old_allowed_roles
+            old_allowed_roles = current_roles.manager_role_names(member.role)
+            return [
+                name
+                for name in current_roles.manager_role_names(role)
+                if name in old_allowed_roles
+            ]
         elif role is not None:
             # Adding/inviting a new role
-            allowed_roles = current_roles.manager_roles(role)
+            return current_roles.manager_role_names(role)
         elif member is not None:
             # Deleting or updating a member with a given role (without changing
             # role)
-            allowed_roles = current_roles.manager_roles(member.role)
+            return current_roles.manager_role_names(member.role)
         else:
             raise NotImplementedError("You must provide a role and/or a member.")
 
-        return [r.name for r in allowed_roles]
-
 
 class CommunityOwners(CommunityRoles):
     """Roles representing the owners of a community."""
@@ -371,11 +505,9 @@ class CommunityOwners(CommunityRoles):
 
     def communities(self, identity):
         """Communities."""
-        return [
-            n.value
-            for n in identity.provides
-            if n.method == "community" and n.role == current_roles.owner_role.name
-        ]
+        return community_needs_index(identity).communities(
+            role=current_roles.owner_role.name
+        )
 
 
 class CommunitySelfMember(Generator):
@@ -419,3 +551,213 @@ class AllowedMemberTypes(Generator):
                 if m not in self.allowed_member_types:
                     return [any_user]
         return []
+
+
+#
+# Compilation of policies
+#
+COMPILED_ACCESS_FIELDS = (
+    "visibility",
+    "members_visibility",
+    "member_policy",
+    "record_submission_policy",
+    "review_policy",
+)
+"""Access fields of a community whose conditional generators are compiled."""
+
+
+def community_access_profile(record):
+    """Get the fields of a community its conditional generators depend on.
+
+    :return: a tuple of the access policies and the deletion status, or
+        ``None`` if the record is not a community object.
+    """
+    access = getattr(record, "access", None)
+    deletion_status = getattr(record, "deletion_status", None)
+    if access is None or deletion_status is None:
+        return None
+    return tuple(str(getattr(access, field)) for field in COMPILED_ACCESS_FIELDS) + (
+        deletion_status.is_deleted,
+    )
+
+
+def _compiled_branches(generator, record, **context):
+    """Get the generators a conditional generator resolves to.
+
+    Only the generators depending on the fields of the community access
+    profile are resolved, since the compiled generators are shared by all the
+    communities with the same profile. Subclasses of ``IfCommunityDeleted``
+    and ``ReviewPolicy`` may branch on other fields, hence are not resolved.
+
+    :return: the resolved generators, or ``None`` if the generator is kept.
+    """
+    if isinstance(generator, SameAs):
+        return generator._generators(**context)
+    if isinstance(generator, IfRestrictedBase):
+        if generator.field_name in {f"access.{f}" for f in COMPILED_ACCESS_FIELDS}:
+            return generator.generators(record)
+        return None
+    if type(generator) is IfCommunityDeleted:
+        return generator.generators(record)
+    if type(generator) is ReviewPolicy:
+        return generator._generators(record)
+    return None
+
+
+def compile_generators(generators, record, **context):
+    """Resolve the conditional generators of a community.
+
+    ``SameAs`` generators and the generators branching on the community
+    access profile (see :func:`community_access_profile`) are replaced by the
+    generators they resolve to. All other generators (e.g. depending on the
+    config or on other fields of the community) are kept as-is, and evaluated
+    on each permission check.
+
+    :param generators: the generators of an action.
+    :param record: the community.
+    :param context: the context of the permission policy.
+    :return: the list of resolved generators.
+    """
+    compiled = []
+    for generator in generators:
+        resolved = _compiled_branches(generator, record, **context)
+        if resolved is None:
+            compiled.append(generator)
+        else:
+            compiled.extend(compile_generators(resolved, record, **context))
+    return compiled
+
+
+#
+# Compilation of query filters
+#
+_FilterLeaf = namedtuple("FilterLeaf", ["generator"])
+_FilterConstant = namedtuple("FilterConstant", ["clauses"])
+_FilterBranch = namedtuple(
+    "FilterBranch", ["then_condition", "else_condition", "then_", "else_"]
+)
+
+_CONSTANT_FILTER_GENERATORS = (AnyUser, AuthenticatedUser, Disable)
+"""Generators whose query filter does not depend on the identity."""
+
+
+def _filter_conditions(query):
+    """Get the conditions of a branch query, a match all query being none."""
+    return () if isinstance(query, dsl.query.MatchAll) else (query,)
+
+
+def _filter_clauses(query):
+    """Get the clauses of the disjunction a generator query filter consists of.
+
+    :return: ``None`` if there is no filter, an empty list if the filter
+        matches no document and ``[()]`` if it matches all documents.
+    """
+    if query is None:
+        return None
+    if isinstance(query, dsl.query.MatchAll):
+        return [()]
+    if isinstance(query, dsl.query.MatchNone):
+        return []
+    if isinstance(query, dsl.query.Terms) and not any(
+        query.to_dict()["terms"].values()
+    ):
+        return []
+    return [(query,)]
+
+
+def _filter_node_order(node):
+    """Evaluate the constant filters and system process first."""
+    if isinstance(node, _FilterConstant):
+        return 0
+    if isinstance(node, _FilterLeaf) and type(node.generator) is SystemProcess:
+        return 1
+    return 2
+
+
+def compile_query_filter(generators, **context):
+    """Compile the query filter of a list of generators.
+
+    ``SameAs`` generators are resolved, the branches of the generators on the
+    access policies and the deletion status of the communities are kept with
+    their conditions, and the filters not depending on the identity are
+    evaluated once. The result only depends on the policy and the action, so
+    that it can be cached and evaluated for each identity with
+    :func:`evaluate_query_filter`.
+
+    :param generators: the generators of an action.
+    :param context: the context of the permission policy.
+    :return: the compiled nodes of the query filter.
+    """
+    nodes = []
+    for generator in generators:
+        if isinstance(generator, SameAs):
+            nodes.extend(
+                compile_query_filter(generator._generators(**context), **context)
+            )
+        elif isinstance(generator, (IfRestrictedBase, IfCommunityDeleted)):
+            then_condition, else_condition = generator.query_conditions()
+            nodes.append(
+                _FilterBranch(
+                    _filter_conditions(then_condition),
+                    _filter_conditions(else_condition),
+                    compile_query_filter(generator.then_, **context),
+                    compile_query_filter(generator.else_, **context),
+                )
+            )
+        elif type(generator) in _CONSTANT_FILTER_GENERATORS:
+            nodes.append(_FilterConstant(_filter_clauses(generator.query_filter())))
+        else:
+            nodes.append(_FilterLeaf(generator))
+    return tuple(sorted(nodes, key=_filter_node_order))
+
+
+def _evaluate_clauses(nodes, **kwargs):
+    """Evaluate compiled nodes to the clauses of a disjunction."""
+    clauses = None
+    for node in nodes:
+        if isinstance(node, _FilterConstant):
+            node_clauses = node.clauses
+        elif isinstance(node, _FilterLeaf):
+            node_clauses = _filter_clauses(node.generator.query_filter(**kwargs))
+        else:
+            then_clauses = _evaluate_clauses(node.then_, **kwargs)
+            else_clauses = _evaluate_clauses(node.else_, **kwargs)
+            node_clauses = [node.then_condition + c for c in then_clauses or []]
+            if else_clauses is None:
+                # Same as the uncompiled filters, the "else" branch is not
+                # filtered if it has no filter.
+                node_clauses.append(node.else_condition)
+            else:
+                node_clauses.extend(node.else_condition + c for c in else_clauses)
+
+        if node_clauses is None:
+            continue
+        if () in node_clauses:
+            # Matches all documents, the other nodes are not evaluated.
+            return [()]
+        clauses = clauses or []
+        clauses.extend(c for c in node_clauses if c not in clauses)
+    return clauses
+
+
+def evaluate_query_filter(nodes, **kwargs):
+    """Evaluate a compiled query filter for an identity.
+
+    Branches matching all or no documents are collapsed, and the remaining
+    ones are combined in a single flat boolean query in filter context.
+
+    :param nodes: the compiled nodes, see :func:`compile_query_filter`.
+    :param kwargs: the context of the permission policy, with the identity.
+    :return: the query filter, or ``None`` if there is no filter.
+    """
+    clauses = _evaluate_clauses(nodes, **kwargs)
+    if clauses is None:
+        return None
+    if not clauses:
+        return dsl.Q("match_none")
+    if () in clauses:
+        return dsl.Q("match_all")
+    queries = [c[0] if len(c) == 1 else dsl.Q("bool", filter=list(c)) for c in clauses]
+    if len(queries) == 1:
+        return queries[0]
+    return dsl.Q("bool", should=queries, minimum_should_match=1)
@@ -4,6 +4,8 @@
 
 """Members Errors."""
 
+from invenio_i18n import gettext as _
+
 from ..errors import CommunityError
 
 
@@ -16,3 +18,13 @@ class InvalidMemberError(CommunityError):
 
     For instance a user/group cannot be found, or is not allowed to be added.
     """
+
+
+class ImportJobNotFoundError(CommunityError):
+    """Error raised when a members import job cannot be found."""
+
+    def __init__(self, job_id):
+        """Initialise error."""
+        super().__init__(
+            _("Members import job {job_id} not found.").format(job_id=job_id)
+        )
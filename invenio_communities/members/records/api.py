@@ -5,7 +5,9 @@
 
 """Members data layer API."""
 
-from invenio_accounts.models import Role, User
+from datetime import datetime, timezone
+
+from invenio_accounts.models import Role
 from invenio_db import db
 from invenio_records.dumpers import SearchDumper
 from invenio_records.dumpers.indexedat import IndexedAtDumperExt
@@ -15,7 +17,7 @@ from invenio_records_resources.records.api import Record
 from invenio_records_resources.records.systemfields import IndexField
 from invenio_requests.records.api import Request
 from invenio_users_resources.records.api import GroupAggregate, UserAggregate
-from sqlalchemy import or_, select
+from sqlalchemy import delete, insert, or_, select, update
 
 from ..errors import InvalidMemberError
 from .dumpers import RequestTypeDumperExt
@@ -105,18 +107,31 @@ class MemberMixin:
         return community_role_list
 
     @classmethod
-    def get_memberships(cls, identity):
-        """Get community memberships for a given identity."""
-        group_ids = []
-        user = User.query.filter(User.id == identity.id).one_or_none()
-        if user:
-            group_ids = [r.id for r in user.roles]
+    def get_memberships(cls, identity, group_ids=None):
+        """Get community memberships for a given identity.
 
-        query = cls.model_cls.query_memberships(
-            user_id=identity.id, group_ids=group_ids
-        )
+        :param group_ids: additional group ids the identity belongs to, which
+            are not stored in the database (e.g. unmanaged groups).
+        """
+        if identity.id is None:
+            return cls.get_memberships_from_group_ids(identity, group_ids)
+
+        query = cls.model_cls.query_user_memberships(identity.id, group_ids=group_ids)
         return [(str(comm_id), role) for comm_id, role in query]
 
+    @classmethod
+    def get_users_memberships(cls, user_ids):
+        """Get community memberships for a list of user ids.
+
+        :return: a dict mapping each user id to its (community, role)-pairs.
+        """
+        memberships = {user_id: [] for user_id in user_ids}
+        if user_ids:
+            query = cls.model_cls.query_users_memberships(user_ids)
+            for user_id, comm_id, role in query:
+                memberships[user_id].append((str(comm_id), role))
+        return memberships
+
     @classmethod
     def get_member_by_request(cls, request_id):
         """Get a membership by request id."""
@@ -158,6 +173,32 @@ class MemberMixin:
 
             return [cls(obj.data, model=obj) for obj in q.all()]
 
+    @classmethod
+    def get_existing_members(cls, community_id, members):
+        """Get the members of a list of users and groups which already exist.
+
+        Invitations and membership requests are included, as they prevent the
+        same user to be added again.
+
+        :return: a set of ``(type, id)`` pairs.
+        """
+        user_ids = [m["id"] for m in members if m["type"] == "user"]
+        group_ids = [m["id"] for m in members if m["type"] == "group"]
+        if not user_ids and not group_ids:
+            return set()
+
+        stmt = select(cls.model_cls.user_id, cls.model_cls.group_id).where(
+            cls.model_cls.community_id == community_id,
+            or_(
+                cls.model_cls.user_id.in_(user_ids),
+                cls.model_cls.group_id.in_(group_ids),
+            ),
+        )
+        return {
+            ("user", str(user_id)) if user_id is not None else ("group", group_id)
+            for user_id, group_id in db.session.execute(stmt)
+        }
+
     @classmethod
     def has_members(cls, community_id, role=None):
         """Get members of a community."""
@@ -207,6 +248,92 @@ class Member(Record, MemberMixin):
     )
     """The ES index used."""
 
+    @classmethod
+    def create_many(cls, community_id, members, **kwargs):
+        """Create several members with a single INSERT statement.
+
+        Contrary to ``create()``, no signals nor record extensions are run.
+
+        :param community_id: the community of the members.
+        :param members: a list of dicts with the ``type`` and ``id`` of each
+            user or group, and optionally the model fields specific to the
+            member (e.g. ``request_id``).
+        :param kwargs: the model fields set on all members (role, active...).
+        :return: the list of created members.
+        """
+        if not members:
+            return []
+        rows = []
+        for m in members:
+            row = {
+                "community_id": community_id,
+                "user_id": None,
+                "group_id": None,
+                "request_id": None,
+                "group_notification_enabled": None,
+                "json": {},
+                "version_id": 1,
+                **kwargs,
+            }
+            row.update((k, v) for k, v in m.items() if k not in ("type", "id"))
+            row[f"{m['type']}_id"] = m["id"]
+            rows.append(row)
+        # Render the null values, so that users and groups are inserted with
+        # the same statement.
+        stmt = (
+            insert(cls.model_cls)
+            .returning(cls.model_cls)
+            .execution_options(render_nulls=True)
+        )
+        with db.session.begin_nested():
+            models = db.session.scalars(stmt, rows).all()
+        return [cls(obj.data, model=obj) for obj in models]
+
+    @classmethod
+    def update_many(cls, members, **values):
+        """Update several members with a single UPDATE statement.
+
+        The version of each member is incremented. Contrary to ``commit()``,
+        no signals nor record extensions are run.
+
+        :param members: the members to update.
+        :param values: the model fields set on all members (role, visible...).
+        :return: the list of updated members.
+        """
+        if not members or not values:
+            return list(members)
+        model_cls = cls.model_cls
+        stmt = (
+            update(model_cls)
+            .where(model_cls.id.in_([m.id for m in members]))
+            .values(
+                version_id=model_cls.version_id + 1,
+                updated=datetime.now(timezone.utc),
+                **values,
+            )
+            .returning(model_cls)
+            .execution_options(populate_existing=True)
+        )
+        with db.session.begin_nested():
+            models = db.session.scalars(stmt).all()
+        return [cls(obj.data, model=obj) for obj in models]
+
+    @classmethod
+    def delete_many(cls, members):
+        """Delete several members with a single DELETE statement.
+
+        Contrary to ``delete(force=True)``, no signals nor record extensions
+        are run.
+
+        :param members: the members to delete.
+        """
+        if not members:
+            return
+        model_cls = cls.model_cls
+        stmt = delete(model_cls).where(model_cls.id.in_([m.id for m in members]))
+        with db.session.begin_nested():
+            db.session.execute(stmt)
+
 
 class ArchivedMemberRequest(Record, MemberMixin):
     """An archived invitation or membership request record.
@@ -7,11 +7,12 @@
 
 import uuid
 
-from invenio_accounts.models import Role, User
+from invenio_accounts.models import Role, User, userrole
 from invenio_db import db
 from invenio_records.models import RecordMetadataBase
 from invenio_requests.records.models import RequestMetadata
-from sqlalchemy import CheckConstraint, Index, or_
+from sqlalchemy import CheckConstraint, Index, or_, select, union
+from sqlalchemy.dialects import postgresql
 from sqlalchemy.ext.declarative import declared_attr
 from sqlalchemy_utils.types import UUIDType
 
@@ -105,6 +106,44 @@ class BaseMemberModel(RecordMetadataBase):
 
         return q.distinct()
 
+    @classmethod
+    def query_user_memberships(cls, user_id, group_ids=None, active=True):
+        """Query for (community,role)-pairs of a user in a single statement.
+
+        Memberships are resolved directly, through the groups of the user and
+        through the given additional group ids (e.g. unmanaged groups).
+        """
+        assert user_id is not None
+        direct = select(cls.community_id, cls.role).where(
+            cls.active == active, cls.user_id == user_id
+        )
+        group_filter = cls.group_id.in_(
+            select(userrole.c.role_id).where(userrole.c.user_id == user_id)
+        )
+        if group_ids:
+            group_filter = or_(group_filter, cls.group_id.in_(group_ids))
+        through_groups = select(cls.community_id, cls.role).where(
+            cls.active == active, group_filter
+        )
+        return db.session.execute(union(direct, through_groups))
+
+    @classmethod
+    def query_users_memberships(cls, user_ids, active=True):
+        """Query for (user,community,role)-triples of several users.
+
+        Memberships are resolved both directly and through the groups of the
+        users, in a single statement.
+        """
+        direct = select(cls.user_id.label("user_id"), cls.community_id, cls.role).where(
+            cls.active == active, cls.user_id.in_(user_ids)
+        )
+        through_groups = (
+            select(userrole.c.user_id.label("user_id"), cls.community_id, cls.role)
+            .join(userrole, userrole.c.role_id == cls.group_id)
+            .where(cls.active == active, userrole.c.user_id.in_(user_ids))
+        )
+        return db.session.execute(union(direct, through_groups))
+
     @classmethod
     def count_members(cls, community_id, role=None, active=True):
         """Count number of members."""
@@ -183,3 +222,86 @@ class ArchivedMemberRequestModel(db.Model, BaseMemberModel):
 
 ArchivedInvitationModel = ArchivedMemberRequestModel
 """Legacy name kept around for compatibility for now."""
+
+
+class MemberImportJobModel(db.Model, db.Timestamp):
+    """Background import of members into a community.
+
+    The submitted entries are stored on the job, and its progress is updated
+    while it is processed so that it can be polled. The results of the
+    entries which were skipped or failed are stored separately (see
+    ``MemberImportResultModel``).
+    """
+
+    __tablename__ = "communities_members_import_jobs"
+
+    id = db.Column(UUIDType, primary_key=True, default=uuid.uuid4)
+
+    community_id = db.Column(
+        UUIDType,
+        db.ForeignKey(CommunityMetadata.id, ondelete="CASCADE"),
+        nullable=False,
+        index=True,
+    )
+
+    user_id = db.Column(
+        db.Integer(),
+        db.ForeignKey(User.id, ondelete="SET NULL"),
+        nullable=True,
+    )
+    """The user who submitted the job."""
+
+    submitted_by_system = db.Column(db.Boolean(), nullable=False, default=False)
+    """Whether the job was submitted by the system (i.e. not by a user)."""
+
+    action = db.Column(db.String(20), nullable=False)
+    """The members service action run on the entries (add or invite)."""
+
+    status = db.Column(db.String(20), nullable=False, default="queued")
+
+    entries = db.Column(
+        db.JSON().with_variant(postgresql.JSONB(), "postgresql"),
+        nullable=False,
+        default=list,
+    )
+    """The entries to import, with their ``row``, ``type``, ``id`` and ``role``."""
+
+    total = db.Column(db.Integer(), nullable=False, default=0)
+
+    processed = db.Column(db.Integer(), nullable=False, default=0)
+
+    started_at = db.Column(db.UTCDateTime(), nullable=True)
+
+    finished_at = db.Column(db.UTCDateTime(), nullable=True)
+
+
+class MemberImportResultModel(db.Model):
+    """Result of an entry of a members import which was skipped or failed.
+
+    The results are appended after each processed chunk of a job.
+    """
+
+    __tablename__ = "communities_members_import_results"
+
+    id = db.Column(db.Integer(), primary_key=True, autoincrement=True)
+
+    job_id = db.Column(
+        UUIDType,
+        db.ForeignKey(MemberImportJobModel.id, ondelete="CASCADE"),
+        nullable=False,
+        index=True,
+    )
+
+    row = db.Column(db.Integer(), nullable=False)
+    """The row of the entry in the submitted file."""
+
+    status = db.Column(db.String(20), nullable=False)
+    """The status of the entry (skipped or failed)."""
+
+    member_type = db.Column(db.String(20), nullable=True)
+
+    member_id = db.Column(db.String(255), nullable=True)
+
+    role = db.Column(db.String(50), nullable=True)
+
+    message = db.Column(db.Text(), nullable=True)
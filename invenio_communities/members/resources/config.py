@@ -13,7 +13,7 @@ from invenio_i18n import lazy_gettext as _
 from invenio_records_resources.resources import RecordResourceConfig
 
 from ...errors import CommunityDeletedError
-from ..errors import AlreadyMemberError, InvalidMemberError
+from ..errors import AlreadyMemberError, ImportJobNotFoundError, InvalidMemberError
 
 
 class MemberResourceConfig(RecordResourceConfig):
@@ -27,10 +27,13 @@ class MemberResourceConfig(RecordResourceConfig):
         "publicmembers": "/communities/<pid_value>/members/public",
         "invitations": "/communities/<pid_value>/invitations",
         "membership_requests": "/communities/<pid_value>/membership-requests",
+        "members_imports": "/communities/<pid_value>/members/imports",
+        "members_import": "/communities/<pid_value>/members/imports/<job_id>",
     }
     request_view_args = {
         "pid_value": ma.fields.UUID(),
         "member_id": ma.fields.Str(),
+        "job_id": ma.fields.UUID(),
     }
 
     error_handlers = {
@@ -48,6 +51,9 @@ class MemberResourceConfig(RecordResourceConfig):
                 ),
             )
         ),
+        ImportJobNotFoundError: create_error_handler(
+            lambda e: HTTPJSONException(code=404, description=str(e))
+        ),
         CommunityDeletedError: create_error_handler(
             lambda e: (
                 HTTPJSONException(
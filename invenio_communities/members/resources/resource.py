@@ -4,8 +4,16 @@
 
 """Invenio Communities Resource API."""
 
-from flask import g
-from flask_resources import resource_requestctx, response_handler, route
+import marshmallow as ma
+from flask import g, request
+from flask_resources import (
+    request_body_parser,
+    request_parser,
+    resource_requestctx,
+    response_handler,
+    route,
+)
+from invenio_records_resources.resources.files.parser import RequestStreamParser
 from invenio_records_resources.resources.records.resource import (
     RecordResource,
     request_data,
@@ -15,6 +23,25 @@ from invenio_records_resources.resources.records.resource import (
 )
 from invenio_records_resources.resources.records.utils import search_preference
 
+from ..services.imports import IMPORT_MIMETYPES
+
+#
+# Decorator helpers
+#
+request_import_stream = request_body_parser(
+    parsers={mimetype: RequestStreamParser() for mimetype in IMPORT_MIMETYPES},
+    default_content_type="application/x-ndjson",
+)
+
+request_import_args = request_parser(
+    {
+        "action": ma.fields.Str(
+            validate=ma.validate.OneOf(["add", "invite"]), load_default="add"
+        ),
+    },
+    location="args",
+)
+
 
 class MemberResource(RecordResource):
     """Members resource."""
@@ -38,6 +65,8 @@ class MemberResource(RecordResource):
             route(
                 "PUT", routes["membership_requests"], self.update_membership_requests
             ),
+            route("POST", routes["members_imports"], self.import_members),
+            route("GET", routes["members_import"], self.read_import),
         ]
 
     @request_view_args
@@ -170,3 +199,29 @@ class MemberResource(RecordResource):
             data=resource_requestctx.data,
         )
         return "", 204
+
+    @request_view_args
+    @request_import_args
+    @request_import_stream
+    @response_handler()
+    def import_members(self):
+        """Submit a background import of members."""
+        job = self.service.import_members(
+            g.identity,
+            resource_requestctx.view_args["pid_value"],
+            resource_requestctx.data["request_stream"],
+            request.mimetype,
+            action=resource_requestctx.args["action"],
+        )
+        return job, 202
+
+    @request_view_args
+    @response_handler()
+    def read_import(self):
+        """Read the progress of a members import."""
+        job = self.service.read_import(
+            g.identity,
+            resource_requestctx.view_args["pid_value"],
+            resource_requestctx.view_args["job_id"],
+        )
+        return job, 200
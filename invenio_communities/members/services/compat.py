@@ -0,0 +1,71 @@
+# SPDX-FileCopyrightText: 2026 CERN.
+# SPDX-License-Identifier: MIT
+
+"""Adapter to the internals of the upstream record and indexer APIs.
+
+The bulk operations of the members service need a few internals of
+``invenio-records`` and ``invenio-indexer``, which are only accessed here.
+"""
+
+import uuid
+
+from invenio_db import db
+
+UPSTREAM_VERSIONS = {
+    "invenio-indexer": ("6.0.0", "7.0.0"),
+    "invenio-records": ("6.0.0", "7.0.0"),
+}
+"""Versions of the upstream packages this adapter was checked against.
+
+The lower bound is inclusive and the upper bound exclusive.
+"""
+
+
+def bulk_action(indexer, record, op_type="index"):
+    """Get the bulk action indexing a record, or deleting it from the index.
+
+    The action is the one sent by ``indexer.index()`` (or ``delete()``).
+    """
+    index = indexer.record_to_index(record)
+    action = {
+        "_op_type": op_type,
+        "_index": indexer._prepare_index(index),
+        "_id": str(record.id),
+        "_version": record.revision_id,
+        "_version_type": indexer._version_type,
+    }
+    if op_type == "index":
+        action["_source"] = indexer._prepare_record(record, index)
+    return action
+
+
+def new_record(record_cls, data, **kwargs):
+    """Initialize a new record like ``create()``, without inserting it.
+
+    The record gets its id right away, so that it can be referenced before it
+    is inserted with ``insert_records()``.
+    """
+    model = record_cls.model_cls(id=uuid.uuid4(), data=data)
+    record = record_cls(data, model=model, **kwargs)
+    for e in record_cls._extensions:
+        e.pre_create(record)
+    return record
+
+
+def insert_records(records):
+    """Insert new records with a single flush.
+
+    Like ``create()`` followed by ``commit()``, the records are validated and
+    the record extensions are run, but no signals are sent.
+    """
+    for record in records:
+        for e in record._extensions:
+            e.pre_commit(record)
+        record.model.json = record._validate()
+    with db.session.begin_nested():
+        db.session.add_all([record.model for record in records])
+    for record in records:
+        for e in record._extensions:
+            e.post_create(record)
+            e.post_commit(record)
+    return records
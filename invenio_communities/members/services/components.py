@@ -11,8 +11,12 @@ from invenio_records_resources.services.records.components import ServiceCompone
 
 from invenio_communities.members.records.api import MemberMixin
 
-from ...proxies import current_identities_cache
-from ...utils import on_group_membership_change, on_user_membership_change
+from ...utils import (
+    on_group_membership_change,
+    on_unmanaged_group_membership_change,
+    on_user_membership_change,
+    on_users_membership_change,
+)
 
 
 class CommunityMemberCachingComponent(ServiceComponent):
@@ -48,6 +52,16 @@ class CommunityMemberCachingComponent(ServiceComponent):
         for user_id in user_ids:
             on_user_membership_change(Identity(user_id))
 
+    def _members_changed(self, members, community=None):
+        """Call caching membership change functions for several members at once."""
+        user_ids = [m.user_id for m in members if m.user_id]
+        if user_ids:
+            on_users_membership_change(user_ids)
+        if any(m.group_id for m in members):
+            if not community:
+                raise TypeError(_("Community must be defined."))
+            on_group_membership_change(str(community.id))
+
     def accept_member_request(self, identity, record=None, data=None, **kwargs):
         """On accept invite or membership request."""
         self._member_changed(record)
@@ -61,7 +75,7 @@ class CommunityMemberCachingComponent(ServiceComponent):
                 for user in users:
                     on_user_membership_change(Identity(user.id))
             else:
-                current_identities_cache.flush()
+                on_unmanaged_group_membership_change(role.id)
         elif record["type"] == "user":
             self._member_changed(record)
 
@@ -76,3 +90,15 @@ class CommunityMemberCachingComponent(ServiceComponent):
     ):
         """On member update."""
         self._member_changed(record, community=community)
+
+    def members_update_many(
+        self, identity, records=None, community=None, data=None, **kwargs
+    ):
+        """On bulk member update."""
+        self._members_changed(records, community=community)
+
+    def members_delete_many(
+        self, identity, records=None, community=None, data=None, **kwargs
+    ):
+        """On bulk member delete."""
+        self._members_changed(records, community=community)
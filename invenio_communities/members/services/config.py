@@ -19,6 +19,7 @@ from ...communities.records.api import Community
 from ...permissions import CommunityPermissionPolicy
 from ..records import Member
 from ..records.api import ArchivedMemberRequest
+from ..records.models import MemberImportJobModel, MemberImportResultModel
 from . import facets
 from .components import CommunityMemberCachingComponent
 from .links import (
@@ -172,6 +173,9 @@ class MemberServiceConfig(RecordServiceConfig, ConfiguratorMixin):
     archive_indexer_cls = RecordServiceConfig.indexer_cls
     archive_indexer_queue_name = "archived-invitations"  # legacy name
 
+    import_job_cls = MemberImportJobModel
+    import_result_cls = MemberImportResultModel
+
     permission_policy_cls = FromConfig(
         "COMMUNITIES_PERMISSION_POLICY", default=CommunityPermissionPolicy
     )
@@ -0,0 +1,158 @@
+# SPDX-FileCopyrightText: 2026 CERN.
+# SPDX-License-Identifier: MIT
+
+"""Members import jobs."""
+
+import csv
+import io
+import json
+from collections import Counter
+from datetime import datetime, timezone
+
+from invenio_i18n import gettext as _
+from marshmallow import ValidationError
+
+IMPORT_MIMETYPES = {
+    "application/x-ndjson": "jsonl",
+    "application/jsonl": "jsonl",
+    "text/csv": "csv",
+}
+"""Supported mimetypes of a members import, with their format."""
+
+IMPORT_FIELDS = ("type", "id", "role")
+"""Fields of an entry of a members import."""
+
+
+def _read_jsonl(stream):
+    """Yield the entries of a JSON lines stream, one per non-empty line."""
+    for line in stream:
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            yield json.loads(line)
+        except ValueError:
+            yield None
+
+
+def _read_csv(stream):
+    """Yield the entries of a CSV stream with a header row."""
+    yield from csv.DictReader(stream)
+
+
+def read_import_entries(stream, mimetype, max_entries):
+    """Read the entries of a members import.
+
+    :param stream: a binary stream of JSON lines or CSV.
+    :param mimetype: the mimetype of the stream.
+    :param max_entries: the maximum number of entries.
+    :return: a tuple of the valid entries and the results of the invalid ones.
+    """
+    if mimetype not in IMPORT_MIMETYPES:
+        raise ValidationError(
+            _("Unsupported import format: %(mimetype)s") % {"mimetype": mimetype}
+        )
+    reader = _read_jsonl if IMPORT_MIMETYPES[mimetype] == "jsonl" else _read_csv
+    text = io.TextIOWrapper(stream, encoding="utf-8", newline="")
+
+    entries, errors = [], []
+    try:
+        for row, data in enumerate(reader(text), start=1):
+            if row > max_entries:
+                raise ValidationError(
+                    _("An import cannot have more than %(max)s entries.")
+                    % {"max": max_entries}
+                )
+            if not isinstance(data, dict) or not all(
+                isinstance(data.get(f), str) and data.get(f) for f in IMPORT_FIELDS
+            ):
+                errors.append(
+                    import_result(
+                        {"row": row}, "failed", _("Invalid entry: type, id and role.")
+                    )
+                )
+                continue
+            entries.append({"row": row, **{f: data[f] for f in IMPORT_FIELDS}})
+    except (UnicodeDecodeError, csv.Error) as e:
+        raise ValidationError(_("Invalid import file.")) from e
+    finally:
+        text.detach()
+
+    if not entries and not errors:
+        raise ValidationError(_("The import is empty."))
+    return entries, errors
+
+
+def import_result(entry, status, message=None):
+    """Get the result of an entry of a members import."""
+    result = {"row": entry["row"], "status": status}
+    for field in IMPORT_FIELDS:
+        if field in entry:
+            result[field] = entry[field]
+    if message:
+        result["message"] = str(message)
+    return result
+
+
+def import_result_values(job_id, result):
+    """Get the column values of the result of an entry of a members import."""
+    return {
+        "job_id": job_id,
+        "row": result["row"],
+        "status": result["status"],
+        "member_type": result.get("type"),
+        "member_id": result.get("id"),
+        "role": result.get("role"),
+        "message": result.get("message"),
+    }
+
+
+def dump_import_result(model):
+    """Dump the stored result of an entry of a members import."""
+    result = {"row": model.row, "status": model.status}
+    for field, value in (
+        ("type", model.member_type),
+        ("id", model.member_id),
+        ("role", model.role),
+        ("message", model.message),
+    ):
+        if value is not None:
+            result[field] = value
+    return result
+
+
+def import_throughput(job):
+    """Get the throughput of a members import, in members per second."""
+    if job.started_at is None:
+        return None
+    finished_at = job.finished_at or datetime.now(timezone.utc)
+    seconds = (finished_at - job.started_at).total_seconds()
+    if seconds <= 0:
+        return None
+    return round(job.processed / seconds, 2)
+
+
+def dump_import_job(job, results):
+    """Dump a members import job.
+
+    Only the skipped and failed entries have a result, the other processed
+    entries were added or invited.
+
+    :param results: the dumped results of the job.
+    """
+    stats = Counter(r["status"] for r in results)
+    stats["succeeded"] = job.processed - len(results)
+    return {
+        "id": str(job.id),
+        "community_id": str(job.community_id),
+        "action": job.action,
+        "status": job.status,
+        "total": job.total,
+        "processed": job.processed,
+        "created": job.created.isoformat() if job.created else None,
+        "started_at": job.started_at.isoformat() if job.started_at else None,
+        "finished_at": job.finished_at.isoformat() if job.finished_at else None,
+        "throughput": import_throughput(job),
+        "stats": dict(stats),
+        "results": results,
+    }
@@ -8,10 +8,14 @@
 from datetime import datetime, timezone
 
 from flask import current_app
-from invenio_access.permissions import system_identity
+from invenio_access.permissions import authenticated_user, system_identity
+from invenio_access.utils import get_identity
+from invenio_accounts.models import User
+from invenio_db import db
 from invenio_i18n import gettext as _
 from invenio_notifications.services.uow import NotificationOp
 from invenio_records_resources.services import LinksTemplate
+from invenio_records_resources.services.errors import PermissionDeniedError
 from invenio_records_resources.services.records import (
     RecordService,
     ServiceSchemaWrapper,
@@ -20,23 +24,40 @@ from invenio_records_resources.services.uow import (
     IndexRefreshOp,
     RecordCommitOp,
     RecordDeleteOp,
+    RecordIndexOp,
+    TaskOp,
     unit_of_work,
 )
 from invenio_requests import current_events_service, current_requests_service
+from invenio_requests.customizations import RequestActions
 from invenio_requests.customizations.event_types import CommentEventType
+from invenio_requests.errors import CannotExecuteActionError
+from invenio_requests.resolvers.registry import ResolverRegistry
 from invenio_search.engine import dsl
 from kombu import Queue
 from marshmallow import ValidationError
+from sqlalchemy import insert, select, update
 from sqlalchemy.exc import IntegrityError
 from werkzeug.local import LocalProxy
 
+from ...errors import CommunityError
 from ...notifications.builders import (
     CommunityInvitationSubmittedNotificationBuilder,
     CommunityMembershipRequestSubmittedNotificationBuilder,
 )
-from ...proxies import current_roles
-from ..errors import AlreadyMemberError, InvalidMemberError
+from ...proxies import current_communities, current_roles
+from ...tasks import broadcast_notifications, process_members_import
+from ...utils import _add_community_needs, chunked_ids
+from ..errors import AlreadyMemberError, ImportJobNotFoundError, InvalidMemberError
 from ..records.api import ArchivedMemberRequest, MemberMixin
+from .compat import insert_records, new_record
+from .imports import (
+    dump_import_job,
+    dump_import_result,
+    import_result,
+    import_result_values,
+    read_import_entries,
+)
 from .request import CommunityInvitation, MembershipRequestRequestType
 from .schemas import (
     AddBulkSchema,
@@ -49,6 +70,7 @@ from .schemas import (
     RequestMembershipSchema,
     UpdateBulkSchema,
 )
+from .uow import BulkIndexDeleteOp, BulkIndexOp
 
 
 def invite_expires_at():
@@ -93,6 +115,16 @@ class MemberService(RecordService):
         """Return archive class."""
         return self.config.archive_cls
 
+    @property
+    def import_job_cls(self):
+        """Return the members import job model class."""
+        return self.config.import_job_cls
+
+    @property
+    def import_result_cls(self):
+        """Return the members import result model class."""
+        return self.config.import_result_cls
+
     @property
     def member_dump_schema(self):
         """Schema for creation."""
@@ -152,30 +184,61 @@ class MemberService(RecordService):
         )
 
     @unit_of_work()
-    def add(self, identity, community_id, data, uow=None):
+    def add(self, identity, community_id, data, uow=None, errors=None):
         """Add group members.
 
         The default permission policy only allow groups to be added. Users must
         be invited.
+
+        All members are inserted with a single statement and indexed with a
+        single bulk request.
+
+        :param errors: if a list is given, the users/groups which are already
+            members (or invited) are skipped and an error is appended to it for
+            each of them, instead of failing the whole batch with an
+            ``AlreadyMemberError``.
         """
-        ret = self._create(
-            identity,
-            community_id,
-            data,
-            self.add_schema,
-            "members_add",
-            self._add_factory,
+        community, data = self._load_create(
+            identity, community_id, data, self.add_schema, "members_add"
+        )
+        members = self._check_duplicates(community, data["members"], errors=errors)
+        self._add_many(
+            community,
+            data["role"],
+            data.get("visible", False),
+            members,
             uow,
+            group_notification_enabled=data.get("group_notification_enabled"),
         )
+        for m in members:
+            # Run components
+            self.run_components(
+                "members_add",
+                identity,
+                record=m,
+                community=community,
+                errors=None,
+                uow=uow,
+            )
+        self._index_community(community, uow)
         # ensure index is refreshed to search for newly added members
         uow.register(IndexRefreshOp(indexer=self.indexer))
-        return ret
+        return True
 
-    def _create(self, identity, community_id, data, schema, action, factory, uow):
-        """Internal method used for both adding and inviting users/groups.
+    def _index_community(self, community, uow):
+        """Reindex a community, to update its indexed member principals."""
+        if not current_app.config["COMMUNITIES_MEMBER_PRINCIPALS_FILTER"]:
+            return
+        if not isinstance(community, self.community_cls):
+            community = self.community_cls.get_record(community)
+        uow.register(
+            RecordIndexOp(community, indexer=current_communities.service.indexer)
+        )
+
+    def _load_create(self, identity, community_id, data, schema, action):
+        """Validate the data and check the permissions to add/invite members.
 
-        The methods are shared because adding and inviting users/groups share
-        the most of the same permission and integrity checks.
+        :return: a tuple of the community and the loaded data.
         """
         community = self.community_cls.get_record(community_id)
         # Validate data (if there are errors, .load() raises)
@@ -184,9 +247,7 @@ class MemberService(RecordService):
             context={"identity": identity},
         )
         role = data["role"]
-        members = data["members"]
         member_types = {m["type"] for m in data["members"]}
-        message = data.get("message")
         # Users are expected to explicitly change their visibility themselves
         # due to data privacy concerns.
         # The system identity can set the visible property to support data
@@ -211,39 +272,77 @@ class MemberService(RecordService):
             member_types=member_types,
         )
 
-        # Add/invite members via the factory function.
+        # TODO: Add support for inviting an email
+        if "email" in member_types:
+            raise ValidationError(_("Invalid member type: email"))
+
+        return community, data
+
+    def _check_duplicates(self, community, members, errors=None):
+        """Filter out the duplicated members.
+
+        Existing members (and invitations) are checked with a single query.
+
+        :param errors: a list to which an error is appended for each duplicated
+            member. If not given, an ``AlreadyMemberError`` is raised if there
+            are duplicated members.
+        :return: the new members.
+        """
+        existing = self.record_cls.get_existing_members(community.id, members)
+        new, duplicates = [], []
         for m in members:
-            # TODO: Add support for inviting an email
-            if m["type"] == "email":
-                raise ValidationError(_("Invalid member type: email"))
+            key = (m["type"], str(m["id"]))
+            if key in existing:
+                duplicates.append(m)
+            else:
+                existing.add(key)
+                new.append(m)
+        if duplicates and errors is None:
+            raise AlreadyMemberError()
+        for m in duplicates:
+            errors.append({"member": m, "message": _("Already a member or invited.")})
+        return new
+
+    def _add_many(
+        self,
+        community,
+        role,
+        visible,
+        members,
+        uow,
+        active=True,
+        group_notification_enabled=None,
+    ):
+        """Add several members to the community in bulk.
 
-            extra = {}
-            if m["type"] == "group":
-                extra["group_notification_enabled"] = data.get(
-                    "group_notification_enabled"
-                )
+        The members are inserted with a single statement and indexed with a
+        single bulk request.
 
-            factory(
-                identity,
-                community,
-                role,
-                visible,
-                m,
-                message,
-                uow,
-                **extra,
-            )
-            # Run components
-            self.run_components(
-                action,
-                identity,
-                record=m,
-                community=community,
-                errors=None,
-                uow=uow,
+        :param members: the members to add, see ``Member.create_many()``.
+        :return: the list of added member records.
+        """
+        try:
+            # Integrity checks still happen here, in case of a concurrent
+            # insert of the same user/group.
+            records = self.record_cls.create_many(
+                community.id,
+                [
+                    (
+                        {**m, "group_notification_enabled": group_notification_enabled}
+                        if m["type"] == "group"
+                        else m
+                    )
+                    for m in members
+                ],
+                role=role.name,
+                active=active,
+                visible=visible,
             )
+        except IntegrityError as e:
+            raise AlreadyMemberError() from e
 
-        return True
+        uow.register(BulkIndexOp(records, indexer=self.indexer))
+        return records
 
     def _add_factory(
         self,
@@ -278,8 +377,6 @@ class MemberService(RecordService):
         except IntegrityError as e:
             raise AlreadyMemberError() from e
 
-        # TODO: Change this to bulk index all member records in one request
-        # instead of N single indexing requests.
         uow.register(RecordCommitOp(member, indexer=self.indexer))
 
     def _members_search(
@@ -468,10 +565,11 @@ class MemberService(RecordService):
         group_notification_enabled = data.get("group_notification_enabled")
 
         # Perform updates (and check permissions)
-        for m in members:
-            self._update(
-                identity, community, m, role, visible, group_notification_enabled, uow
-            )
+        self._update_many(
+            identity, community, members, role, visible, group_notification_enabled, uow
+        )
+        if role is not None:
+            self._index_community(community, uow)
 
         # Make sure we're not left owner-less if a role was changed.
         if role is not None:
@@ -487,86 +585,139 @@ class MemberService(RecordService):
 
         return True
 
-    def _update(
+    def _permission_key(self, identity, member):
+        """Get the key of the members sharing the same update/delete permissions.
+
+        The bulk actions check the permissions once per key. It covers the
+        member fields used by the permission generators: the role, the member
+        type, the status and visibility, and whether the member is the identity
+        itself. Generators depending on other member fields would only be
+        evaluated for the first member of each key.
+        """
+        is_self = identity.id is not None and str(member.user_id) == str(identity.id)
+        member_type = "user" if member.user_id is not None else "group"
+        return (member.role, member_type, member.active, member.visible, is_self)
+
+    def _update_many(
         self,
         identity,
         community,
-        member,
+        members,
         role,
         visible,
         group_notification_enabled,
         uow,
     ):
-        """Update a member's role/visibility/notifcation."""
+        """Update the role/visibility/notification of several members at once.
+
+        The permissions are checked once per group of similar members (see
+        ``_permission_key()``), and the members are updated with a single
+        statement and reindexed with a single bulk request.
+        """
         # DO NOT USE DIRECTLY - always use update() which will correctly check
         # if we're left without an owner!
-        self.require_permission(
-            identity,
-            "members_update",
-            record=community,
-            member=member,
-            role=role.name if role is not None else None,
-        )
-        is_self = identity.id is not None and str(member.user_id) == str(identity.id)
-
-        # Pre-conditions:
-        # You cannot change your own role (owners, managers, members = all)
-        # For owners/managers, this prevents them accidentally loosing access.
-        # They will have to ask another owner/manager to change their role.
-        # For curators/readers, they should not be be allowed to change their
-        # own role. Having a business rule avoid making the permissions overly
-        # complex.
-        if role is not None and is_self:
-            raise ValidationError(_("You cannot change your own role."))
-
-        # Owners/managers can change visibility to false for users, and
-        # true/false for groups. Users themselves can change their own
-        # visibility. System identity can can always change for all.
-        if visible is not None and member.user_id is not None:
-            if visible and not (is_self or system_identity == identity):
-                raise ValidationError(
-                    _("You can only set public visibility on your own membership."),
+        checked = set()
+        for member in members:
+            is_self = identity.id is not None and str(member.user_id) == str(
+                identity.id
+            )
+            key = self._permission_key(identity, member)
+            if key not in checked:
+                self.require_permission(
+                    identity,
+                    "members_update",
+                    record=community,
+                    member=member,
+                    role=role.name if role is not None else None,
                 )
+                checked.add(key)
+
+            # Pre-conditions:
+            # You cannot change your own role (owners, managers, members = all)
+            # For owners/managers, this prevents them accidentally loosing
+            # access. They will have to ask another owner/manager to change
+            # their role. For curators/readers, they should not be be allowed
+            # to change their own role. Having a business rule avoid making
+            # the permissions overly complex.
+            if role is not None and is_self:
+                raise ValidationError(_("You cannot change your own role."))
+
+            # Owners/managers can change visibility to false for users, and
+            # true/false for groups. Users themselves can change their own
+            # visibility. System identity can can always change for all.
+            if visible is not None and member.user_id is not None:
+                if visible and not (is_self or system_identity == identity):
+                    raise ValidationError(
+                        _("You can only set public visibility on your own membership."),
+                    )
 
-        # Update membership
+        values = {}
         if role is not None:
-            if not member.active:  # still an invitation
-                data = {
-                    "payload": {
-                        "content": _(
-                            'You will join as "%(role)s" (changed from: "%(previous)s").'
-                        )
-                        % {"role": role.title, "previous": member.role},
-                    }
+            invitations = [m for m in members if not m.active]
+            if invitations:
+                requests = {
+                    r.id: r
+                    for r in current_requests_service.record_cls.get_records(
+                        [m.request_id for m in invitations]
+                    )
                 }
-                current_events_service.create(
-                    identity, member.request_id, data, CommentEventType, uow=uow
+                self._create_comments(
+                    identity,
+                    [requests[m.request_id] for m in invitations],
+                    [
+                        _('You will join as "%(role)s" (changed from: "%(previous)s").')
+                        % {"role": role.title, "previous": m.role}
+                        for m in invitations
+                    ],
+                    uow,
                 )
-
-            # update role
-            member.role = role.name
+            values["role"] = role.name
         if visible is not None:
-            member.visible = visible
+            values["visible"] = visible
         if group_notification_enabled is not None:
-            member.group_notification_enabled = group_notification_enabled
+            values["group_notification_enabled"] = group_notification_enabled
+
+        # Update membership
+        records = self.record_cls.update_many(members, **values)
 
         # Run components
-        self.run_components(
+        self._run_components_many(
             "members_update",
             identity,
-            record=member,
+            records,
             community=community,
             errors=None,
             uow=uow,
         )
 
-        uow.register(RecordCommitOp(member, self.indexer))
+        uow.register(BulkIndexOp(records, indexer=self.indexer))
 
         return True
 
+    def _run_components_many(self, action, identity, records, uow=None, **kwargs):
+        """Run the components of an action on several records.
+
+        Components implementing the ``<action>_many`` hook are called once with
+        all the records, the other ones once per record.
+        """
+        for component in self.components:
+            component.uow = uow
+            if hasattr(component, f"{action}_many"):
+                getattr(component, f"{action}_many")(
+                    identity, records=records, **kwargs
+                )
+            elif hasattr(component, action):
+                for record in records:
+                    getattr(component, action)(identity, record=record, **kwargs)
+            component.uow = None
+
     @unit_of_work()
     def delete(self, identity, community_id, data, uow=None):
-        """Bulk delete."""
+        """Bulk delete.
+
+        The members are deleted with a single statement and removed from the
+        index with a single bulk request.
+        """
         community = self.community_cls.get_record(community_id)
 
         # Permission check - validates that:
@@ -587,23 +738,30 @@ class MemberService(RecordService):
             raise InvalidMemberError()
 
         # Perform deletes (and check permissions)
+        checked = set()
         for m in members:
-            self.require_permission(
-                identity,
-                "members_delete",
-                record=community,
-                member=m,
-            )
-            # Run components
-            self.run_components(
-                "members_delete",
-                identity,
-                record=m,
-                community=community,
-                errors=None,
-                uow=uow,
-            )
-            uow.register(RecordDeleteOp(m, self.indexer, force=True))
+            key = self._permission_key(identity, m)
+            if key not in checked:
+                self.require_permission(
+                    identity,
+                    "members_delete",
+                    record=community,
+                    member=m,
+                )
+                checked.add(key)
+        # Run components
+        self._run_components_many(
+            "members_delete",
+            identity,
+            members,
+            community=community,
+            errors=None,
+            uow=uow,
+        )
+        self.record_cls.delete_many(members)
+        uow.register(BulkIndexDeleteOp(members, indexer=self.indexer))
+
+        self._index_community(community, uow)
 
         # Make sure we're not left owner-less
         if not self.record_cls.has_members(
@@ -631,18 +789,38 @@ class MemberService(RecordService):
         """Not implemented."""
         raise NotImplementedError("Use add() or invite()")
 
-    def rebuild_index(self, identity, uow=None):
+    def rebuild_index(
+        self, identity, uow=None, community_id=None, chunk_size=None, progress=None
+    ):
         """Reindex all records managed by this service.
 
+        Only the ids are streamed from the database, with a server-side
+        cursor, and sent to the bulk indexer in chunks.
+
         Note: Skips (soft) deleted records.
-        """
-        members = self.record_cls.model_cls.query.filter_by(is_deleted=False).all()
-        self.indexer.bulk_index([member.id for member in members])
 
-        archived_member_requests = self.archive_cls.model_cls.query.filter_by(
-            is_deleted=False
-        ).all()
-        self.archive_indexer.bulk_index([r.id for r in archived_member_requests])
+        :param community_id: only reindex the members of this community.
+        :param chunk_size: the number of records per chunk.
+        :param progress: a callable called after each chunk with the name of
+            the reindexed records (``members`` or ``archived``) and the number
+            of records sent so far.
+        """
+        chunk_size = (
+            chunk_size or current_app.config["COMMUNITIES_MEMBERS_REINDEX_CHUNK_SIZE"]
+        )
+        for name, model_cls, indexer in (
+            ("members", self.record_cls.model_cls, self.indexer),
+            ("archived", self.archive_cls.model_cls, self.archive_indexer),
+        ):
+            stmt = select(model_cls.id).filter_by(is_deleted=False)
+            if community_id is not None:
+                stmt = stmt.filter_by(community_id=community_id)
+            count = 0
+            for ids in chunked_ids(stmt, chunk_size):
+                indexer.bulk_index(ids)
+                count += len(ids)
+                if progress is not None:
+                    progress(name, count)
 
         return True
 
@@ -667,6 +845,7 @@ class MemberService(RecordService):
         )
 
         uow.register(RecordCommitOp(member, indexer=self.indexer, index_refresh=True))
+        self._index_community(member.community_id, uow)
         uow.register(
             RecordCommitOp(
                 archived_member_request,
@@ -699,105 +878,229 @@ class MemberService(RecordService):
 
     # Member requests - Invitation
 
-    def _invite_factory(
-        self,
-        identity,
-        community,
-        role,
-        visible,
-        member,
-        message,
-        uow,
-        **kwargs,
+    def _create_requests(
+        self, identity, request_type, data, receivers, creator, topic, expires_at, uow
     ):
-        """Invite a member to the community."""
-        if member["type"] == "group":
-            # Groups cannot be invited, because groups have no one who can
-            # accept an invitation.
-            raise InvalidMemberError(member)
-
-        # Add member entry
-        if member["type"] == "user":
-            # Create request
-            title = _('Invitation to join "%(community)s"') % {
-                "community": community.metadata["title"]
-            }
-            description = _('You will join as "%(role)s".') % {"role": role.title}
-
-            request_item = current_requests_service.create(
+        """Create several requests of the same type in bulk.
+
+        Each request goes through the permission check, the components and the
+        create action of the requests service, like with its ``create()``, but
+        the requests are inserted with a single flush and indexed with a single
+        bulk request.
+
+        :param receivers: the receiver of each request.
+        :return: the list of created request records.
+        """
+        service = current_requests_service
+        schema = ServiceSchemaWrapper(service, schema=request_type.marshmallow_schema())
+        data, errors = schema.load(
+            data, context={"identity": identity}, raise_errors=False
+        )
+        created_by = ResolverRegistry.reference_entity(creator, raise_=True)
+        topic_ref = ResolverRegistry.reference_entity(topic, raise_=True)
+
+        requests = []
+        for receiver in receivers:
+            service.require_permission(
                 identity,
-                {
-                    "title": title,
-                    "description": description,
-                },
-                CommunityInvitation,
-                {"user": member["id"]},
-                creator=community,
-                # TODO: perhaps topic should be the actual membership record
-                # instead
-                topic=community,
-                expires_at=invite_expires_at(),
+                "create",
+                data=data,
+                request_type=request_type,
+                receiver=receiver,
+                creator=creator,
+                record=topic,
+                expires_at=expires_at,
+            )
+            request = new_record(
+                service.record_cls, {}, type=request_type, expires_at=expires_at
+            )
+            service.run_components(
+                "create",
+                identity,
+                data=data,
+                record=request,
+                errors=errors,
+                created_by=created_by,
+                topic=topic_ref,
+                receiver=ResolverRegistry.reference_entity(receiver, raise_=True),
                 uow=uow,
             )
+            action = RequestActions.get_action(request, request_type.create_action)
+            if not action.can_execute():
+                raise CannotExecuteActionError(request_type.create_action)
+            action.execute(identity, uow)
+            requests.append(request)
+
+        insert_records(requests)
+        uow.register(BulkIndexOp(requests, indexer=service.indexer))
+        return requests
+
+    def _create_comments(
+        self, identity, requests, contents, uow, notify=True, index_requests=True
+    ):
+        """Comment on several requests in bulk.
+
+        Each comment goes through the permission checks and the components of
+        the request events service, like with its ``create()``, but the
+        comments are inserted with a single flush and indexed with a single
+        bulk request, and their notifications are broadcast by a single task.
+
+        :param contents: the content of the comment on each request.
+        :param index_requests: reindex the requests, to update their computed
+            fields (e.g. the last activity).
+        :return: the list of created event records.
+        """
+        service = current_events_service
+        schema = ServiceSchemaWrapper(
+            service, schema=CommentEventType.marshmallow_schema()
+        )
+        created_by = ResolverRegistry.reference_identity(identity)
 
-            # message was provided.
-            if message:
-                data = {"payload": {"content": message}}
-                current_events_service.create(
+        events, notifications = [], []
+        for request, content in zip(requests, contents):
+            data = {"payload": {"content": content}}
+            for action in ("read", "create_comment"):
+                service.require_permission(
                     identity,
-                    request_item.id,
-                    data,
-                    CommentEventType,
-                    uow=uow,
-                    notify=False,
+                    action,
+                    request=request,
+                    data=data,
+                    event_type=CommentEventType,
+                    notify=notify,
                 )
-
+            data, errors = schema.load(data, context={"identity": identity})
+            event = new_record(
+                service.record_cls,
+                {},
+                request=request.model,
+                request_id=str(request.id),
+                type=CommentEventType,
+            )
+            event.update(data)
+            event.created_by = created_by
+            service.run_components(
+                "create", identity, data=data, event=event, errors=errors, uow=uow
+            )
+            events.append(event)
+            if notify:
+                builder = request.type.comment_notification_builder
+                notifications.append(builder.build(request, event))
+
+        insert_records(events)
+        uow.register(BulkIndexOp(events, indexer=service.indexer))
+        if index_requests:
             uow.register(
-                NotificationOp(
-                    CommunityInvitationSubmittedNotificationBuilder.build(
-                        request=request_item._request,
-                        # explicit string conversion to get the value of LazyText
-                        role=str(role.title),
-                        message=message,
-                    )
-                )
+                BulkIndexOp(requests, indexer=current_requests_service.indexer)
             )
+        if notifications:
+            uow.register(
+                TaskOp(broadcast_notifications, [n.dumps() for n in notifications])
+            )
+        return events
 
-            # Create an inactive member entry linked to the request.
-            self._add_factory(
+    def _invite_many(self, identity, community, role, visible, members, message, uow):
+        """Invite several users to the community in bulk.
+
+        The requests, comment events and inactive members are created in
+        bulk, then indexed with a single bulk request per index, and the
+        notifications are broadcast by a single task.
+        """
+        if not members:
+            return []
+        title = _('Invitation to join "%(community)s"') % {
+            "community": community.metadata["title"]
+        }
+        description = _('You will join as "%(role)s".') % {"role": role.title}
+        requests = self._create_requests(
+            identity,
+            CommunityInvitation,
+            {"title": title, "description": description},
+            [{"user": m["id"]} for m in members],
+            # TODO: perhaps topic should be the actual membership record instead
+            creator=community,
+            topic=community,
+            expires_at=invite_expires_at(),
+            uow=uow,
+        )
+
+        # message was provided.
+        if message:
+            self._create_comments(
                 identity,
-                community,
-                role,
-                visible,
-                member,
-                message,
+                requests,
+                [message] * len(requests),
                 uow,
-                active=False,
-                request_id=request_item.id,
+                notify=False,
+                index_requests=False,
             )
 
+        notifications = [
+            CommunityInvitationSubmittedNotificationBuilder.build(
+                request=request,
+                # explicit string conversion to get the value of LazyText
+                role=str(role.title),
+                message=message,
+            )
+            for request in requests
+        ]
+        uow.register(
+            TaskOp(broadcast_notifications, [n.dumps() for n in notifications])
+        )
+
+        # Create the inactive member entries linked to the requests.
+        invited = [
+            {**member, "request_id": request.id}
+            for member, request in zip(members, requests)
+        ]
+        return self._add_many(community, role, visible, invited, uow, active=False)
+
     @unit_of_work()
-    def invite(self, identity, community_id, data, uow=None):
+    def invite(self, identity, community_id, data, uow=None, errors=None):
         """Invite group members.
 
         Only users and email member types can be invited, and a member can only
         have one invitation per community
 
         Email member type is not yet supported.
+
+        :param errors: if a list is given, the users which are already members
+            (or invited) are skipped and an error is appended to it for each of
+            them, instead of failing the whole batch with an
+            ``AlreadyMemberError``.
         """
-        ret = self._create(
+        community, data = self._load_create(
+            identity, community_id, data, self.invite_schema, "members_invite"
+        )
+        for m in data["members"]:
+            if m["type"] == "group":
+                # Groups cannot be invited, because groups have no one who can
+                # accept an invitation.
+                raise InvalidMemberError(m)
+
+        members = self._check_duplicates(community, data["members"], errors=errors)
+        self._invite_many(
             identity,
-            community_id,
-            data,
-            self.invite_schema,
-            "members_invite",
-            self._invite_factory,
+            community,
+            data["role"],
+            data.get("visible", False),
+            members,
+            data.get("message"),
             uow,
         )
+        for m in members:
+            # Run components
+            self.run_components(
+                "members_invite",
+                identity,
+                record=m,
+                community=community,
+                errors=None,
+                uow=uow,
+            )
 
         # ensure index is refreshed to search for newly added members
         uow.register(IndexRefreshOp(indexer=self.indexer))
-        return ret
+        return True
 
     @property
     def invitation_dump_schema(self):
@@ -966,6 +1269,198 @@ class MemberService(RecordService):
             **kwargs,
         )
 
+    # Members imports
+
+    @unit_of_work()
+    def import_members(
+        self, identity, community_id, stream, mimetype, action="add", uow=None
+    ):
+        """Submit a background import of members.
+
+        The ``type``, ``id`` and ``role`` entries are read from a JSON lines or
+        CSV stream and stored on a job, which is processed by a task.
+
+        :param action: the action run on the entries (``add`` or ``invite``).
+        :return: the dumped job.
+        """
+        community = self.community_cls.get_record(community_id)
+        self.require_permission(identity, "members_import", record=community)
+        if action not in ("add", "invite"):
+            raise ValidationError(
+                _("Invalid import action: %(action)s") % {"action": action}
+            )
+
+        entries, errors = read_import_entries(
+            stream,
+            mimetype,
+            current_app.config["COMMUNITIES_MEMBERS_IMPORT_MAX_ENTRIES"],
+        )
+        job = self.import_job_cls(
+            community_id=community.id,
+            user_id=None if identity == system_identity else identity.id,
+            submitted_by_system=identity == system_identity,
+            action=action,
+            status="queued",
+            entries=entries,
+            total=len(entries) + len(errors),
+            processed=len(errors),
+        )
+        with db.session.begin_nested():
+            db.session.add(job)
+            db.session.flush()
+            self._save_import_results(job.id, errors)
+        uow.register(TaskOp(process_members_import, str(job.id)))
+        return dump_import_job(job, errors)
+
+    def read_import(self, identity, community_id, job_id):
+        """Read the progress and the results of a members import."""
+        community = self.community_cls.get_record(community_id)
+        self.require_permission(identity, "members_import", record=community)
+        job = db.session.get(self.import_job_cls, job_id)
+        if job is None or job.community_id != community.id:
+            raise ImportJobNotFoundError(job_id)
+        return dump_import_job(job, self._import_results(job.id))
+
+    def _save_import_results(self, job_id, results):
+        """Append results to a members import."""
+        if results:
+            db.session.execute(
+                insert(self.import_result_cls),
+                [import_result_values(job_id, r) for r in results],
+            )
+
+    def _import_results(self, job_id):
+        """Get the dumped results of a members import, ordered by row."""
+        model_cls = self.import_result_cls
+        models = db.session.scalars(
+            select(model_cls)
+            .where(model_cls.job_id == job_id)
+            .order_by(model_cls.row, model_cls.id)
+        )
+        return [dump_import_result(m) for m in models]
+
+    def process_import(self, job_id):
+        """Process a members import, chunk by chunk.
+
+        The entries are grouped by role and each chunk goes through the bulk
+        add/invite path, skipping the existing members. The progress and the
+        results are committed after each chunk, so that they can be polled.
+        Only the entries which were skipped or failed have a result, which is
+        appended to the results of the job.
+        """
+        model_cls = self.import_job_cls
+        job = db.session.get(model_cls, job_id)
+        if job is None or job.status != "queued":
+            return
+        job_id, entries = job.id, job.entries
+        action = self.add if job.action == "add" else self.invite
+        community_id = job.community_id
+        chunk_size = current_app.config["COMMUNITIES_MEMBERS_IMPORT_CHUNK_SIZE"]
+
+        def update_job(**values):
+            db.session.execute(
+                update(model_cls).where(model_cls.id == job_id).values(**values)
+            )
+            db.session.commit()
+
+        update_job(status="running", started_at=datetime.now(timezone.utc))
+        processed = job.processed
+        status = "completed"
+        try:
+            identity = self._import_identity(job)
+            for role, chunk in self._import_chunks(entries, chunk_size):
+                results = self._import_chunk(
+                    identity, action, community_id, role, chunk
+                )
+                processed += len(chunk)
+                self._save_import_results(job_id, results)
+                update_job(processed=processed)
+        except Exception:
+            db.session.rollback()
+            current_app.logger.exception("Members import %s failed.", job_id)
+            status = "failed"
+        update_job(status=status, finished_at=datetime.now(timezone.utc))
+
+    def _import_identity(self, job):
+        """Get the identity of the user who submitted a members import.
+
+        The identity is built without a request context, hence without the
+        unmanaged groups of the user's session. For this reason, its
+        memberships are read from the database and not written to the
+        identities cache, which the user's requests would trust.
+        """
+        if job.submitted_by_system:
+            return system_identity
+        user = db.session.get(User, job.user_id) if job.user_id else None
+        if user is None or not user.active:
+            # The submitter was deleted or deactivated since.
+            raise PermissionDeniedError("members_import")
+        identity = get_identity(user)
+        identity.provides.add(authenticated_user)
+        _add_community_needs(identity, self.record_cls.get_memberships(identity))
+        return identity
+
+    def _import_chunks(self, entries, chunk_size):
+        """Yield the role and the chunks of the import entries of each role."""
+        by_role = {}
+        for entry in entries:
+            by_role.setdefault(entry["role"], []).append(entry)
+        for role, role_entries in by_role.items():
+            for i in range(0, len(role_entries), chunk_size):
+                yield role, role_entries[i : i + chunk_size]
+
+    def _import_chunk(self, identity, action, community_id, role, entries):
+        """Add or invite a chunk of import entries.
+
+        If the whole chunk is rejected, it is split in halves which are retried
+        to isolate the rejected entries, within a bounded number of retries.
+        Once they are exhausted, the remaining entries fail with the error of
+        their sub-chunk.
+
+        :return: the results of the skipped and failed entries.
+        """
+        retries = [current_app.config["COMMUNITIES_MEMBERS_IMPORT_MAX_RETRIES"]]
+        return self._import_entries(
+            identity, action, community_id, role, entries, retries
+        )
+
+    def _import_entries(self, identity, action, community_id, role, entries, retries):
+        """Add or invite import entries, splitting them when rejected.
+
+        :param retries: a single-item list with the retries left for the chunk.
+        """
+        data = {
+            "members": [{"type": e["type"], "id": e["id"]} for e in entries],
+            "role": role,
+        }
+        errors = []
+        try:
+            action(identity, community_id, data, errors=errors)
+        except (ValidationError, PermissionDeniedError, CommunityError) as e:
+            db.session.rollback()
+            if len(entries) == 1 or retries[0] < 2:
+                message = e.messages if isinstance(e, ValidationError) else str(e)
+                return [
+                    import_result(entry, "failed", message or _("Failed."))
+                    for entry in entries
+                ]
+            retries[0] -= 2
+            middle = len(entries) // 2
+            return [
+                result
+                for half in (entries[:middle], entries[middle:])
+                for result in self._import_entries(
+                    identity, action, community_id, role, half, retries
+                )
+            ]
+
+        skipped = {(err["member"]["type"], str(err["member"]["id"])) for err in errors}
+        return [
+            import_result(e, "skipped", _("Already a member or invited."))
+            for e in entries
+            if (e["type"], e["id"]) in skipped
+        ]
+
     def get_request_id_of_pending_member(self, identity, community_id):
         """
         Return request id of invitation/membership request pending for user+community.
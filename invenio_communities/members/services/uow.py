@@ -0,0 +1,57 @@
+# SPDX-FileCopyrightText: 2026 CERN.
+# SPDX-License-Identifier: MIT
+
+"""Unit of work operations for the members service."""
+
+from flask import current_app
+from invenio_records_resources.services.uow import Operation
+from invenio_search.engine import search
+
+from .compat import bulk_action
+
+
+class BulkIndexOp(Operation):
+    """Index several records in a single bulk request.
+
+    Contrary to ``RecordBulkIndexOp``, the records are indexed synchronously
+    once the transaction is committed, and not through the indexer queue.
+    """
+
+    ignore_status = ()
+    """Status codes of the bulk items which are not errors."""
+
+    def __init__(self, records, indexer=None, index_refresh=False):
+        """Initialize the bulk index operation."""
+        self._records = records
+        self._indexer = indexer
+        self._index_refresh = index_refresh
+
+    def _actions(self):
+        """Iterate the bulk actions."""
+        return (bulk_action(self._indexer, r) for r in self._records)
+
+    def on_commit(self, uow):
+        """Index the records."""
+        if self._indexer is None or not self._records:
+            return
+        search.helpers.bulk(
+            self._indexer.client,
+            self._actions(),
+            refresh=self._index_refresh,
+            request_timeout=current_app.config["INDEXER_BULK_REQUEST_TIMEOUT"],
+            ignore_status=self.ignore_status,
+        )
+
+
+class BulkIndexDeleteOp(BulkIndexOp):
+    """Delete several records from the index in a single bulk request.
+
+    The records are expected to be already deleted from the database.
+    """
+
+    # Deleting a record which is not indexed is not an error.
+    ignore_status = (404,)
+
+    def _actions(self):
+        """Iterate the bulk actions."""
+        return (bulk_action(self._indexer, r, "delete") for r in self._records)
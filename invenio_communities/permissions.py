@@ -7,6 +7,8 @@
 
 """Community permissions."""
 
+from itertools import chain
+
 from invenio_administration.generators import Administration
 from invenio_records_permissions.generators import (
     AnyUser,
@@ -17,6 +19,7 @@ from invenio_records_permissions.generators import (
     SystemProcess,
 )
 from invenio_records_permissions.policies import BasePermissionPolicy
+from invenio_search.engine import dsl
 from invenio_users_resources.services.generators import GroupsEnabled
 from invenio_users_resources.services.permissions import UserManager
 
@@ -34,6 +37,11 @@ from .generators import (
     IfRecordSubmissionPolicyClosed,
     IfRestricted,
     ReviewPolicy,
+    community_access_profile,
+    compile_generators,
+    compile_query_filter,
+    evaluate_query_filter,
+    resolve_community_needs,
 )
 
 
@@ -157,6 +165,10 @@ class CommunityPermissionPolicy(BasePermissionPolicy):
         AllowedMemberTypes("user", "email"),
         SystemProcess(),
     ]
+    can_members_import = [  # Ability to submit and read members import jobs
+        CommunityManagers(),
+        SystemProcess(),
+    ]
     can_invite_owners = [CommunityOwners(), SystemProcess()]
     can_search_invites = [CommunityManagers(), SystemProcess()]
     # request_membership permission is based on configuration, community settings and
@@ -202,6 +214,91 @@ class CommunityPermissionPolicy(BasePermissionPolicy):
     # Permission for assigning a parent community
     can_manage_parent = [Administration(), SystemProcess()]
 
+    compiled = True
+    """Evaluate needs and excludes on generators compiled per community profile."""
+
+    _compiled_generators = {}
+
+    @property
+    def compiled_generators(self):
+        """Generators of the action, resolved for the community.
+
+        The resolved generators are cached per action and community profile
+        (access policies and deletion status), so that the conditional
+        generators are not evaluated on each permission check.
+        """
+        record = self.over.get("record")
+        profile = community_access_profile(record)
+        if not self.compiled or profile is None:
+            return self.generators
+
+        key = (type(self), self.action, profile)
+        generators = self._compiled_generators.get(key)
+        if generators is None:
+            generators = compile_generators(self.generators, record, **self.over)
+            self._compiled_generators[key] = generators
+        return generators
+
+    @property
+    def needs(self):
+        """Set of Needs granting permission."""
+        needs = [generator.needs(**self.over) for generator in self.compiled_generators]
+        self.explicit_needs |= set(chain.from_iterable(needs))
+        self._load_permissions()
+        return self._permissions.needs
+
+    @property
+    def excludes(self):
+        """Set of Needs denying permission."""
+        excludes = [
+            generator.excludes(**self.over) for generator in self.compiled_generators
+        ]
+        self.explicit_excludes |= set(chain.from_iterable(excludes))
+        self._load_permissions()
+        return self._permissions.excludes
+
+    def allows(self, identity):
+        """Check the permission, resolving the community needs it checks."""
+        resolve_community_needs(identity, self)
+        return super().allows(identity)
+
+    _compiled_query_filters = {}
+
+    @property
+    def query_filters(self):
+        """List of search engine query filters.
+
+        The query filter of the action is compiled once per action, and only
+        its identity dependent parts are evaluated on each search. Superusers
+        get a single match all filter.
+        """
+        if not self.compiled:
+            return super().query_filters
+        if self._query_filters_superuser([]):
+            return [dsl.Q("match_all")]
+
+        key = (type(self), self.action)
+        nodes = self._compiled_query_filters.get(key)
+        if nodes is None:
+            nodes = compile_query_filter(self.generators, **self.over)
+            self._compiled_query_filters[key] = nodes
+        query = evaluate_query_filter(nodes, **self.over)
+        return [query] if query is not None else []
+
+
+def uses_default_permissions(policy_cls):
+    """Determine if a policy keeps all the permissions of the default policy.
+
+    The decisions of the default permissions only depend on the community
+    access profile (see ``community_access_profile``) and on the community of
+    the role needs, hence can be shared between the communities of a profile.
+    """
+    return all(
+        getattr(policy_cls, name, None) is getattr(CommunityPermissionPolicy, name)
+        for name in dir(CommunityPermissionPolicy)
+        if name.startswith("can_")
+    )
+
 
 def can_perform_action(community, context):
     """Check if the given action is available on the request."""
@@ -4,7 +4,7 @@
 
 """Registry and definition of community roles."""
 
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, fields
 
 from invenio_i18n import lazy_gettext as _
 
@@ -47,7 +47,11 @@ class Role:
 
 
 class RoleRegistry:
-    """Registry of community roles."""
+    """Registry of community roles.
+
+    Lookups by name, the roles having a capability and the roles managing a
+    role are computed once, since they are used on every permission check.
+    """
 
     def __init__(self, roles_definitions):
         """Initialize the role registry."""
@@ -61,19 +65,36 @@ class RoleRegistry:
                 self._owner = r
         assert self._owner is not None, _("One role must be defined as owner.")
 
+        self._by_name = {role.name: role for role in self._roles}
+        self._names = tuple(role.name for role in self._roles)
+
+        # Capability (e.g. "manage") to the roles having it
+        self._capabilities = {
+            f.name[len("can_") :]: tuple(r for r in self._roles if getattr(r, f.name))
+            for f in fields(Role)
+            if f.name.startswith("can_") and f.type is bool
+        }
+        self._capability_names = {
+            action: tuple(r.name for r in roles)
+            for action, roles in self._capabilities.items()
+        }
+
+        # Role name to the roles that can manage it
+        self._managers = {
+            name: tuple(r for r in self._roles if r.can_manage_role(name))
+            for name in self._names
+        }
+        self._manager_names = {
+            name: tuple(r.name for r in roles) for name, roles in self._managers.items()
+        }
+
     def __contains__(self, key):
         """Determine if key is a valid role id."""
-        for role in self._roles:
-            if key == role.name:
-                return True
-        return False
+        return key in self._by_name
 
     def __getitem__(self, key):
         """Get a role for a specific key."""
-        for role in self._roles:
-            if key == role.name:
-                return role
-        raise KeyError(key)
+        return self._by_name[key]
 
     def __iter__(self):
         """Iterate list of roles."""
@@ -84,6 +105,11 @@ class RoleRegistry:
         """Get a list of roles."""
         return self._roles
 
+    @property
+    def names(self):
+        """Get the names of all roles."""
+        return self._names
+
     @property
     def owner_role(self):
         """Get the owner role."""
@@ -91,9 +117,15 @@ class RoleRegistry:
 
     def can(self, action):
         """Returns the roles that can do the action."""
-        for role in self.roles:
-            if getattr(role, f"can_{action}"):
-                yield role
+        if action in self._capabilities:
+            return iter(self._capabilities[action])
+        return (role for role in self.roles if getattr(role, f"can_{action}"))
+
+    def names_can(self, action):
+        """Returns the names of the roles that can do the action."""
+        if action in self._capability_names:
+            return self._capability_names[action]
+        return tuple(role.name for role in self.can(action))
 
     def manager_roles(self, role_name):
         """Get all roles that can manage members a given role.
@@ -104,9 +136,8 @@ class RoleRegistry:
         This is used for instance to ensure that a manager cannot invite an
         owner and thereby escalate their privileges.
         """
-        allowed_roles = []
+        return self._managers.get(role_name, ())
 
-        for role in self.roles:
-            if role.can_manage_role(role_name):
-                allowed_roles.append(role)
-        return allowed_roles
+    def manager_role_names(self, role_name):
+        """Get the names of all roles that can manage members a given role."""
+        return self._manager_names.get(role_name, ())
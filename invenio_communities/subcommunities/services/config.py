@@ -12,7 +12,7 @@ from invenio_records_resources.services.base.config import (
 )
 from invenio_records_resources.services.records.results import RecordItem
 
-from invenio_communities.generators import CommunityOwners
+from invenio_communities.generators import CommunityOwners, resolve_community_needs
 from invenio_communities.subcommunities.services.request import SubCommunityRequest
 
 from .schema import SubcommunityRequestSchema
@@ -30,6 +30,11 @@ class SubCommunityPermissionPolicy(BasePermissionPolicy):
     can_update = [Disable()]
     can_delete = [Disable()]
 
+    def allows(self, identity):
+        """Check the permission, resolving the community needs it checks."""
+        resolve_community_needs(identity, self)
+        return super().allows(identity)
+
 
 class SubCommunityServiceConfig(ServiceConfig, ConfiguratorMixin):
     """SubCommunity service configuration."""
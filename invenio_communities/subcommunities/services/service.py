@@ -15,6 +15,7 @@ from invenio_requests.proxies import current_requests_service as requests_servic
 from werkzeug.local import LocalProxy
 
 import invenio_communities.notifications.builders as notifications
+from invenio_communities.generators import community_needs_index
 from invenio_communities.proxies import current_communities, current_roles
 
 from .errors import ParentChildrenNotAllowed
@@ -53,15 +54,8 @@ class SubCommunityService(Service):
 
     def _is_owner_of(self, identity, community):
         """Check if the identity provides community ownership."""
-        return next(
-            (
-                x
-                for x in identity.provides
-                if x.method == "community"
-                and x.value == community
-                and x.role == current_roles.owner_role.name
-            ),
-            None,
+        return community_needs_index(identity).has_role(
+            community, current_roles.owner_role.name
         )
 
     @unit_of_work()
@@ -3,9 +3,18 @@
 
 """Invenio communities tasks."""
 
+from datetime import datetime, timedelta, timezone
+
 from celery import shared_task
+from flask import current_app
+from invenio_notifications.tasks import broadcast_notification
 
-from invenio_communities.proxies import current_identities_cache
+from invenio_communities.proxies import current_communities, current_identities_cache
+from invenio_communities.utils import (
+    chunked_user_ids,
+    on_users_membership_change,
+    warm_identities_cache,
+)
 
 
 @shared_task
@@ -15,3 +24,43 @@ def clear_cache():
     This is meant to be used to delete the community caches that contain the identity id of the users.
     """
     current_identities_cache.flush()
+
+
+@shared_task
+def clear_users_cache(user_ids):
+    """Clears the identity cache of the given users."""
+    on_users_membership_change(user_ids)
+
+
+@shared_task
+def broadcast_notifications(notifications):
+    """Broadcasts several notifications in a single task."""
+    for notification in notifications:
+        broadcast_notification(notification)
+
+
+@shared_task
+def process_members_import(job_id):
+    """Processes a members import job."""
+    current_communities.service.members.process_import(job_id)
+
+
+@shared_task
+def warm_cache(user_ids):
+    """Pre-populates the identity cache of the given users."""
+    warm_identities_cache(user_ids)
+
+
+@shared_task
+def warm_cache_active_users(days=None):
+    """Pre-populates the identity cache of the active users, in chunks.
+
+    :param days: only include users who logged in during the last days (all
+        active users if not set).
+    """
+    active_since = None
+    if days is not None:
+        active_since = datetime.now(timezone.utc) - timedelta(days=days)
+    chunk_size = current_app.config["COMMUNITIES_IDENTITIES_CACHE_WARM_CHUNK_SIZE"]
+    for user_ids in chunked_user_ids(chunk_size, active_since=active_since):
+        warm_cache.delay(user_ids)
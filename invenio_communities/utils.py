@@ -4,17 +4,23 @@
 """Utilities."""
 
 from decimal import ROUND_HALF_UP, Decimal
+from time import perf_counter
 
-from flask import session
+from flask import current_app, g, has_request_context, session
 from flask_principal import Identity
-from invenio_accounts.models import Role
+from invenio_accounts.models import LoginInformation, User, userrole
 from invenio_accounts.proxies import current_db_change_history
+from invenio_db import db
+from sqlalchemy import select
 
-from .generators import CommunityRoleNeed
-from .proxies import current_communities, current_identities_cache
+from .cache.codec import decode_community_roles, encode_community_roles
+from .generators import LAZY_IDENTITIES_KEY, CommunityNeedsIndex, CommunityRoleNeed
+from .proxies import current_communities, current_identities_cache, current_roles
 
 IDENTITY_KEY = "user-communities:"
 
+GROUP_KEY = "group-identities:"
+
 
 def load_community_needs(identity):
     """Add community-related needs to the freshly loaded identity.
@@ -25,11 +31,34 @@ def load_community_needs(identity):
     Thus, the given identity may not be fully initialized and still missing
     some needs (e.g. 'authenticated_user'), so we cannot rely on high-level
     service functions because permission checks may fail.
+
+    If ``COMMUNITIES_IDENTITIES_LAZY_NEEDS`` is enabled, only a resolver is
+    attached to the identity and the needs are added once a permission checks
+    them.
     """
     if identity.id is None:
         # no user is logged in
         return
 
+    roles_ids = session.get("unmanaged_roles_ids", [])
+    if current_app.config["COMMUNITIES_IDENTITIES_LAZY_NEEDS"]:
+        identity.community_needs_resolver = CommunityNeedsResolver(roles_ids)
+        identity.provides = LazyCommunityProvides(identity)
+        # Registered so that the needs of a community are resolved as soon as
+        # any permission policy generates them (see ``resolve_lazy_needs``).
+        g.setdefault(LAZY_IDENTITIES_KEY, []).append(identity)
+        return
+
+    _add_community_needs(identity, get_community_roles(identity, roles_ids))
+
+
+def get_community_roles(identity, roles_ids):
+    """Get the community roles of an identity from the cache.
+
+    :param identity: the identity of a user.
+    :param roles_ids: the ids of the unmanaged groups of the user.
+    :return: list of (community id, role name) pairs.
+    """
     # Cache keys
     #
     # The cache of communities must be invalidated on:
@@ -44,32 +73,190 @@ def load_community_needs(identity):
     # entities and combine it into a single list.
 
     # Currently, only users are supported (no roles or system roles)
+    start = perf_counter()
     cache_key = identity_cache_key(identity)
-    community_roles = current_identities_cache.get(cache_key)
+    role_names = current_roles.names
+    cached = current_identities_cache.get(cache_key)
+    if isinstance(cached, dict):
+        # Warmed entries lack the memberships through unmanaged groups, they
+        # are only complete for users without any.
+        cached = None if roles_ids else cached["roles"]
+    community_roles = decode_community_roles(cached, role_names)
     if community_roles is None:
-        # aka Member.get_memberships(identity)
-        roles_ids = session.get("unmanaged_roles_ids", [])
-
+        # Memberships of the user, through its groups and through the
+        # unmanaged groups held in the session, resolved in a single query.
         member_cls = current_communities.service.members.config.record_cls
-        managed_community_roles = member_cls.get_memberships(identity)
-        unmanaged_community_roles = member_cls.get_memberships_from_group_ids(
-            identity, roles_ids
-        )
-        community_roles = managed_community_roles + unmanaged_community_roles
+        community_roles = member_cls.get_memberships(identity, group_ids=roles_ids)
 
-        for community_id, role in community_roles:
-            current_identities_cache.append(community_id, identity.id)
-            # Add community needs to identity
-            identity.provides.add(CommunityRoleNeed(community_id, role))
+        # Index the identity by community and by unmanaged group, so that it
+        # can be invalidated when the memberships of either change.
+        identity_index = {
+            community_id: [identity.id] for community_id, _ in community_roles
+        }
+        for role_id in roles_ids:
+            identity_index[group_cache_key(role_id)] = [identity.id]
+        current_identities_cache.append_values(identity_index)
 
         current_identities_cache.set(
-            cache_key,
-            community_roles,
+            cache_key, _dump_community_roles(community_roles, role_names)
+        )
+        current_identities_cache.metrics.observe(
+            "load_community_needs.miss", perf_counter() - start
         )
     else:
-        # Add community needs to identity
-        for community_id, role in community_roles:
-            identity.provides.add(CommunityRoleNeed(community_id, role))
+        current_identities_cache.metrics.observe(
+            "load_community_needs.hit", perf_counter() - start
+        )
+    return community_roles
+
+
+class CommunityNeedsResolver:
+    """Resolves the community needs of an identity on demand.
+
+    The community roles are read from the identity cache the first time a
+    community is checked, and the needs are only added to the identity for
+    the communities being checked.
+    """
+
+    def __init__(self, roles_ids):
+        """Constructor.
+
+        :param roles_ids: the ids of the unmanaged groups of the user.
+        """
+        self.roles_ids = list(roles_ids)
+        self._roles_by_community = None
+        self._loaded = set()
+        self.complete = False
+
+    def roles_by_community(self, identity):
+        """Get the community roles of the identity, grouped by community."""
+        if self._roles_by_community is None:
+            self._roles_by_community = {}
+            for community_id, role in get_community_roles(identity, self.roles_ids):
+                self._roles_by_community.setdefault(community_id, []).append(role)
+        return self._roles_by_community
+
+    def load(self, identity, community_ids):
+        """Add the needs of the given communities to the identity."""
+        if self.complete:
+            return
+        roles_by_community = self.roles_by_community(identity)
+        community_roles = []
+        for community_id in set(community_ids) - self._loaded:
+            for role in roles_by_community.get(community_id, []):
+                community_roles.append((community_id, role))
+            self._loaded.add(community_id)
+        if community_roles:
+            _add_community_needs(identity, community_roles)
+
+    def load_all(self, identity):
+        """Add the needs of all communities to the identity."""
+        if not self.complete:
+            self.load(identity, self.roles_by_community(identity))
+            self.complete = True
+
+
+class LazyCommunityProvides(set):
+    """Needs of an identity whose community needs are resolved on demand.
+
+    Iterating the needs, e.g. to build the query filters of a search in any
+    permission policy, resolves all community needs first. Membership tests
+    are not affected.
+    """
+
+    def __init__(self, identity):
+        """Constructor."""
+        super().__init__(identity.provides)
+        self.identity = identity
+        self._resolving = False
+
+    def __iter__(self):
+        """Iterate the needs, once all community needs are resolved."""
+        resolver = getattr(self.identity, "community_needs_resolver", None)
+        if resolver is not None and not resolver.complete and not self._resolving:
+            self._resolving = True
+            try:
+                resolver.load_all(self.identity)
+            finally:
+                self._resolving = False
+        return super().__iter__()
+
+
+def _add_community_needs(identity, community_roles):
+    """Add community needs to identity and attach their index."""
+    index = CommunityNeedsIndex(identity.provides)
+    for community_id, role in community_roles:
+        identity.provides.add(CommunityRoleNeed(community_id, role))
+        index.add(community_id, role)
+    index.size = len(identity.provides)
+    identity.community_needs = index
+
+
+def _dump_community_roles(community_roles, role_names):
+    """Return the value to cache for the community roles of an identity."""
+    if current_app.config["COMMUNITIES_IDENTITIES_CACHE_COMPACT_ROLES"]:
+        return encode_community_roles(community_roles, role_names)
+    return community_roles
+
+
+def warm_identities_cache(user_ids):
+    """Pre-populate the cached community roles of several users.
+
+    The memberships of all users are resolved with a single query and written
+    to the cache in a single batch.
+
+    Memberships through unmanaged groups are only known from the user session,
+    hence the entries are marked as managed-only and are treated as a miss
+    for identities with unmanaged groups.
+    """
+    member_cls = current_communities.service.members.config.record_cls
+    role_names = current_roles.names
+    memberships = member_cls.get_users_memberships(list(user_ids))
+
+    community_identities = {}
+    for user_id, community_roles in memberships.items():
+        for community_id, _ in community_roles:
+            community_identities.setdefault(community_id, set()).add(user_id)
+
+    current_identities_cache.append_values(community_identities)
+    current_identities_cache.set_many(
+        {
+            identity_cache_key(Identity(user_id)): {
+                "managed_only": True,
+                "roles": _dump_community_roles(community_roles, role_names),
+            }
+            for user_id, community_roles in memberships.items()
+        }
+    )
+    return len(memberships)
+
+
+def chunked_user_ids(chunk_size, active_since=None):
+    """Yield chunks of ids of active users.
+
+    :param chunk_size: the number of ids per chunk.
+    :param active_since: only include users who logged in since this date.
+    """
+    stmt = select(User.id).filter(User.active.is_(True))
+    if active_since is not None:
+        stmt = stmt.join(LoginInformation, LoginInformation.user_id == User.id).filter(
+            LoginInformation.current_login_at >= active_since
+        )
+    return chunked_ids(stmt.order_by(User.id), chunk_size)
+
+
+def chunked_ids(stmt, chunk_size):
+    """Yield chunks of the ids selected by a statement.
+
+    The ids are streamed with a server-side cursor, so that only one chunk is
+    held in memory.
+
+    :param stmt: a select statement of a single id column.
+    :param chunk_size: the number of ids per chunk.
+    """
+    result = db.session.execute(stmt, execution_options={"yield_per": chunk_size})
+    for partition in result.scalars().partitions():
+        yield list(partition)
 
 
 def on_user_membership_change(identity=None):
@@ -80,10 +267,21 @@ def on_user_membership_change(identity=None):
 
 def on_group_membership_change(community_id):
     """Handler called when a group membership is changed."""
-    community_identities_cache = current_identities_cache.get(community_id)
-    if community_identities_cache:
-        for identity in community_identities_cache:
-            on_user_membership_change(Identity(identity))
+    identity_ids = current_identities_cache.values(community_id)
+    current_identities_cache.delete_many(
+        [identity_cache_key(Identity(identity_id)) for identity_id in identity_ids]
+    )
+
+
+def on_unmanaged_group_membership_change(group_id):
+    """Handler called when the memberships of an unmanaged group are changed.
+
+    Only the identities which resolved their memberships through the group
+    are invalidated.
+    """
+    on_users_membership_change(
+        current_identities_cache.values(group_cache_key(group_id))
+    )
 
 
 def identity_cache_key(identity):
@@ -91,21 +289,46 @@ def identity_cache_key(identity):
     return f"{IDENTITY_KEY}{identity.id}"
 
 
+def group_cache_key(group_id):
+    """Make the cache key for indexing the identities of an unmanaged group."""
+    return f"{GROUP_KEY}{group_id}"
+
+
+def on_users_membership_change(user_ids):
+    """Handler called when the memberships of several users are changed."""
+    current_identities_cache.delete_many(
+        [identity_cache_key(Identity(user_id)) for user_id in user_ids]
+    )
+
+
 def on_datastore_post_commit(sender, session):
     """Clears the cache for the user identity."""
     sid = id(session)
-    if current_db_change_history.sessions.get(sid):
-        for user_id in current_db_change_history.sessions[sid].updated_users:
-            on_user_membership_change(Identity(user_id))
+    changes = current_db_change_history.sessions.get(sid)
+    if not changes:
+        return
 
-        for user_id in current_db_change_history.sessions[sid].deleted_users:
-            on_user_membership_change(Identity(user_id))
+    user_ids = set(changes.updated_users) | set(changes.deleted_users)
+    if changes.deleted_roles:
+        query = (
+            db.session.query(userrole.c.user_id)
+            .filter(userrole.c.role_id.in_(changes.deleted_roles))
+            .distinct()
+        )
+        user_ids.update(user_id for (user_id,) in query)
+    if not user_ids:
+        # e.g. only roles or domains were changed
+        return
 
-        for role_id in current_db_change_history.sessions[sid].deleted_roles:
-            role = Role.query.filter_by(id=role_id).one_or_none()
-            users = role.users.all()
-            for user in users:
-                on_user_membership_change(Identity(user.id))
+    threshold = current_app.config[
+        "COMMUNITIES_IDENTITIES_CACHE_ASYNC_INVALIDATION_THRESHOLD"
+    ]
+    if threshold is not None and len(user_ids) > threshold:
+        from .tasks import clear_users_cache
+
+        clear_users_cache.delay(list(user_ids))
+    else:
+        on_users_membership_change(user_ids)
 
 
 def humanize_byte_size(size):
@@ -117,3 +340,76 @@ def humanize_byte_size(size):
         if s < BYTES_PER_UNIT:
             return s.quantize(q, rounding=ROUND_HALF_UP), unit
         s /= BYTES_PER_UNIT
+
+
+class PermissionDecisions:
+    """Memo of the community permission decisions of a request.
+
+    Decisions are keyed on the identity, the action and the community id and
+    revision, so that a permission rendered several times in a page (e.g. by
+    the UI serializer and the menus) is evaluated once.
+    """
+
+    def __init__(self):
+        """Constructor."""
+        self.decisions = {}
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _community_key(community):
+        """Get the id and revision of a community (item, record or dict)."""
+        if community is None:
+            return None, None
+        record = getattr(community, "_record", community)
+        community_id = getattr(record, "id", None)
+        revision_id = getattr(record, "revision_id", None)
+        if community_id is None and isinstance(record, dict):
+            community_id = record.get("id")
+            revision_id = record.get("revision_id")
+        return str(community_id), revision_id
+
+    def check(self, identity, action, community, evaluate):
+        """Get a decision, evaluating it if not yet known.
+
+        :param identity: the identity.
+        :param action: the action name.
+        :param community: the community, or ``None``.
+        :param evaluate: callable evaluating the permission.
+        """
+        # The number of needs guards against needs added during the request.
+        key = (identity.id, len(identity.provides), action) + self._community_key(
+            community
+        )
+        if key in self.decisions:
+            self.hits += 1
+            return self.decisions[key]
+        self.misses += 1
+        decision = self.decisions[key] = bool(evaluate())
+        return decision
+
+
+def permission_decisions():
+    """Get the permission decisions memo of the current request."""
+    return g.setdefault("communities_permission_decisions", PermissionDecisions())
+
+
+def check_community_permission(identity, action, community=None, evaluate=None):
+    """Check a community permission, memoized for the current request.
+
+    :param evaluate: callable evaluating the permission, by default the
+        permission is checked with the communities service.
+    """
+    if evaluate is None:
+
+        def evaluate():
+            kwargs = {}
+            if community is not None:
+                kwargs["record"] = getattr(community, "_record", community)
+            return current_communities.service.check_permission(
+                identity, action, **kwargs
+            )
+
+    if not has_request_context():
+        return evaluate()
+    return permission_decisions().check(identity, action, community, evaluate)
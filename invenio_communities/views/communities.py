@@ -7,7 +7,7 @@
 
 from copy import deepcopy
 
-from flask import abort, current_app, g, render_template
+from flask import abort, current_app, g, has_request_context, render_template
 from flask.templating import _render
 from flask_login import login_required
 from invenio_i18n import lazy_gettext as _
@@ -15,7 +15,10 @@ from invenio_records_resources.services.errors import PermissionDeniedError
 from invenio_vocabularies.proxies import current_service as vocabulary_service
 from jinja2 import TemplateError
 
-from invenio_communities.proxies import current_communities
+from invenio_communities.generators import CommunityRoleNeed
+from invenio_communities.permissions import CommunityPermissionPolicy
+from invenio_communities.proxies import current_communities, current_roles
+from invenio_communities.utils import check_community_permission
 
 from ..communities.resources.ui_schema import TypesSchema
 from ..errors import LogoNotFoundError
@@ -174,21 +177,99 @@ def render_community_theme_template(template_name_or_list, theme=None, **context
         return render_template(templates, **context)
 
 
-def _filter_roles(action, member_types, community_id, identity=None):
-    """Compute current identity roles for action, member type and community."""
+def allowed_roles(community_id, actions, identity=None):
+    """Compute the roles the identity can assign, for several actions at once.
+
+    If the permission policy uses the default generators of an action, it is
+    evaluated once, for a single role. The allowed roles are then derived from
+    the community roles of the identity and the roles they can manage
+    (``RoleRegistry.manager_roles``), which are the only role-dependent needs
+    of the default generators. Otherwise the policy is evaluated for each role.
+
+    Results are cached per identity and community for the current request.
+
+    :param community_id: the community id.
+    :param actions: list of (action, member types) pairs.
+    :return: list of the allowed roles (as in ``COMMUNITIES_ROLES``) for each
+        of the given actions.
+    """
     identity = identity or g.identity
-    service_config = current_communities.service.config
-    roles = []
-    for role in current_app.config["COMMUNITIES_ROLES"]:
-        permission = service_config.permission_policy_cls(
+    cache = {}
+    if has_request_context():
+        cache = g.setdefault("communities_allowed_roles", {})
+    community_id = str(community_id)
+    results = []
+    for action, member_types in actions:
+        key = (
+            identity.id,
+            len(identity.provides),
+            community_id,
             action,
-            community_id=community_id,
-            role=role["name"],
-            member_types=member_types,
+            frozenset(member_types),
         )
-        if permission.allows(identity):
-            roles.append(role)
-    return roles
+        if key not in cache:
+            cache[key] = _compute_allowed_roles(
+                identity, community_id, action, member_types
+            )
+        results.append(cache[key])
+    return results
+
+
+def _has_default_generators(policy_cls, action):
+    """Determine if the policy uses the default generators of an action."""
+    name = f"can_{action}"
+    default = getattr(CommunityPermissionPolicy, name, None)
+    return default is not None and getattr(policy_cls, name, None) is default
+
+
+def _compute_allowed_roles(identity, community_id, action, member_types):
+    """Compute the roles the identity can assign for an action."""
+    roles = current_app.config["COMMUNITIES_ROLES"]
+    policy_cls = current_communities.service.config.permission_policy_cls
+    if not _has_default_generators(policy_cls, action):
+        return [
+            role
+            for role in roles
+            if policy_cls(
+                action,
+                community_id=community_id,
+                role=role["name"],
+                member_types=member_types,
+            ).allows(identity)
+        ]
+
+    probe_role = roles[0]["name"]
+    permission = policy_cls(
+        action,
+        community_id=community_id,
+        role=probe_role,
+        member_types=member_types,
+    )
+    resolver = getattr(identity, "community_needs_resolver", None)
+    if resolver is not None:
+        resolver.load(identity, [community_id])
+
+    def manager_needs(role_name):
+        return {
+            CommunityRoleNeed(community_id, name)
+            for name in current_roles.manager_role_names(role_name)
+        }
+
+    if permission.excludes & identity.provides:
+        return []
+    base_needs = permission.needs - manager_needs(probe_role)
+
+    allowed = []
+    for role in roles:
+        needs = base_needs | manager_needs(role["name"])
+        if not needs or needs & identity.provides:
+            allowed.append(role)
+    return allowed
+
+
+def _filter_roles(action, member_types, community_id, identity=None):
+    """Compute current identity roles for action, member type and community."""
+    return allowed_roles(community_id, [(action, member_types)], identity=identity)[0]
 
 
 def _get_roles_can_update(community_id):
@@ -198,15 +279,15 @@ def _get_roles_can_update(community_id):
 
 def _get_roles_can_invite(community_id):
     """Get the full list of roles that current identity can invite."""
-    return dict(
-        user=_filter_roles("members_invite", {"user"}, community_id),
-        group=_filter_roles("members_add", {"group"}, community_id),
+    user, group = allowed_roles(
+        community_id, [("members_invite", {"user"}), ("members_add", {"group"})]
     )
+    return dict(user=user, group=group)
 
 
 def communities_frontpage():
     """Communities index page."""
-    can_create = current_communities.service.check_permission(g.identity, "create")
+    can_create = check_community_permission(g.identity, "create")
     return render_template(
         "invenio_communities/frontpage.html",
         permissions=dict(can_create=can_create),
@@ -215,7 +296,7 @@ def communities_frontpage():
 
 def communities_search():
     """Communities search page."""
-    can_create = current_communities.service.check_permission(g.identity, "create")
+    can_create = check_community_permission(g.identity, "create")
     return render_template(
         "invenio_communities/search.html",
         permissions=dict(can_create=can_create),
@@ -266,7 +347,7 @@ def load_custom_fields(dump_only_required=False):
 @login_required
 def communities_new():
     """Communities creation page."""
-    can_create = current_communities.service.check_permission(g.identity, "create")
+    can_create = check_community_permission(g.identity, "create")
     if not can_create:
         raise PermissionDeniedError()
 
@@ -298,7 +379,7 @@ def communities_new_subcommunity(pid_value, community, community_ui):
     if not community["children"]["allow"]:
         abort(404)
 
-    can_create = current_communities.service.check_permission(g.identity, "create")
+    can_create = check_community_permission(g.identity, "create")
     if not can_create:
         raise PermissionDeniedError()
 
@@ -18,6 +18,7 @@ from invenio_communities.communities.resources.serializer import (
     UICommunityJSONSerializer,
 )
 from invenio_communities.proxies import current_communities
+from invenio_communities.utils import check_community_permission
 
 from ..errors import CommunityDeletedError, LogoNotFoundError
 from ..searchapp import search_app_context
@@ -83,7 +84,7 @@ def record_permission_denied_error(error):
 
 def _can_create_community():
     """Function used to check if a user has permissions to create a community."""
-    return current_communities.service.check_permission(g.identity, "create")
+    return check_community_permission(g.identity, "create")
 
 
 def _show_create_community_link():
@@ -0,0 +1,82 @@
+# SPDX-FileCopyrightText: 2026 CERN.
+# SPDX-License-Identifier: MIT
+
+"""Cached community roles encoding tests."""
+
+import pickle
+import timeit
+import uuid
+
+import pytest
+
+from invenio_communities.cache.codec import (
+    decode_community_roles,
+    encode_community_roles,
+)
+
+ROLE_NAMES = ["owner", "manager", "curator", "reader"]
+
+
+def _community_roles(n):
+    """Generate community roles."""
+    return [(str(uuid.uuid4()), ROLE_NAMES[i % 4]) for i in range(n)]
+
+
+def test_roundtrip():
+    """Test encoding and decoding."""
+    community_roles = _community_roles(10)
+    value = encode_community_roles(community_roles, ROLE_NAMES)
+    assert isinstance(value, bytes)
+    assert decode_community_roles(value, ROLE_NAMES) == community_roles
+    value = encode_community_roles([], ROLE_NAMES)
+    assert decode_community_roles(value, ROLE_NAMES) == []
+
+
+def test_legacy_and_invalid_values():
+    """Test legacy lists are read and invalid values are ignored."""
+    community_roles = _community_roles(2)
+    assert decode_community_roles(community_roles, ROLE_NAMES) == community_roles
+    assert decode_community_roles(None, ROLE_NAMES) is None
+    assert decode_community_roles(b"\x00", ROLE_NAMES) is None
+
+    value = encode_community_roles(community_roles, ROLE_NAMES)
+    # Unknown version
+    assert decode_community_roles(b"\xff" + value[1:], ROLE_NAMES) is None
+    # Truncated payload
+    assert decode_community_roles(value[:-1], ROLE_NAMES) is None
+    # Changed roles configuration
+    assert decode_community_roles(value, ROLE_NAMES[::-1]) is None
+
+
+def test_unknown_role():
+    """Test roles missing from the registry are kept unencoded."""
+    community_roles = [(str(uuid.uuid4()), "unknown")]
+    value = encode_community_roles(community_roles, ROLE_NAMES)
+    assert value == community_roles
+
+
+def test_savings():
+    """Test the encoding is smaller than pickling."""
+    community_roles = _community_roles(2000)
+    pickled = pickle.dumps(community_roles, protocol=pickle.HIGHEST_PROTOCOL)
+    encoded = encode_community_roles(community_roles, ROLE_NAMES)
+
+    assert decode_community_roles(encoded, ROLE_NAMES) == community_roles
+    assert len(encoded) < len(pickled) / 2
+
+
+@pytest.mark.benchmark
+def test_benchmark_savings():
+    """Report the size and decoding time compared to pickling."""
+    community_roles = _community_roles(2000)
+    pickled = pickle.dumps(community_roles, protocol=pickle.HIGHEST_PROTOCOL)
+    encoded = encode_community_roles(community_roles, ROLE_NAMES)
+
+    pickle_time = timeit.timeit(lambda: pickle.loads(pickled), number=20)
+    decode_time = timeit.timeit(
+        lambda: decode_community_roles(encoded, ROLE_NAMES), number=20
+    )
+    print(
+        f"pickle: {len(pickled)} bytes, {pickle_time:.4f}s; "
+        f"encoded: {len(encoded)} bytes, {decode_time:.4f}s"
+    )
@@ -0,0 +1,106 @@
+# SPDX-FileCopyrightText: 2026 CERN.
+# SPDX-License-Identifier: MIT
+
+"""In-memory identity cache tests."""
+
+import time
+import timeit
+
+import pytest
+
+from invenio_communities.cache.memory import IdentityMemoryCache
+from invenio_communities.cache.redis import IdentityRedisCache
+
+
+@pytest.fixture()
+def memory_cache(app):
+    """In-memory identity cache."""
+    return IdentityMemoryCache(app)
+
+
+def test_get_set_delete(memory_cache):
+    """Test basic operations."""
+    value = [("comm", "reader")]
+    memory_cache.set("foo", value)
+    assert memory_cache.get("foo") == value
+    # Values are copies
+    memory_cache.get("foo").append(("other", "owner"))
+    assert memory_cache.get("foo") == value
+    memory_cache.delete("foo")
+    assert memory_cache.get("foo") is None
+
+
+def test_flush(memory_cache):
+    """Test flushing the cache."""
+    memory_cache.set("foo", "bar")
+    memory_cache.append("comm", 1)
+    memory_cache.flush()
+    assert memory_cache.get("foo") is None
+    assert memory_cache.values("comm") == []
+    assert memory_cache.size == 0
+
+
+def test_append_values(memory_cache):
+    """Test values are appended to a set."""
+    memory_cache.append("comm_1", 1)
+    memory_cache.append("comm_1", 1)
+    memory_cache.append_many(["comm_1", "comm_2"], 2)
+    assert sorted(memory_cache.values("comm_1")) == ["1", "2"]
+    assert memory_cache.values("comm_2") == ["2"]
+
+
+def test_timeout(memory_cache):
+    """Test entries expire."""
+    memory_cache.set("foo", "bar", timeout=1)
+    assert memory_cache.get("foo") == "bar"
+    time.sleep(1.1)
+    assert memory_cache.get("foo") is None
+
+
+def test_memory_accounting(app, memory_cache):
+    """Test entries are evicted once the memory limit is reached."""
+    memory_cache.cache.maxbytes = 1000
+    memory_cache.set("small", "x")
+    assert 0 < memory_cache.size < 1000
+    for i in range(10):
+        memory_cache.set(f"big_{i}", "x" * 200)
+    assert memory_cache.size <= 1000
+    assert memory_cache.get("small") is None
+    assert memory_cache.get("big_9") == "x" * 200
+
+
+def test_same_as_redis(app, memory_cache):
+    """Test the in-memory backend stores the same values as the Redis one."""
+    redis_cache = IdentityRedisCache(app)
+    redis_cache.flush()
+    value = [(f"{i:032x}", "reader") for i in range(100)]
+
+    def run(cache):
+        cache.set("user-communities:1", value)
+        cache.append_many(["comm_1", "comm_2"], 1)
+        result = [
+            cache.get("user-communities:1"),
+            sorted(cache.values("comm_1")),
+        ]
+        cache.delete("user-communities:1")
+        return result + [cache.get("user-communities:1")]
+
+    assert run(memory_cache) == run(redis_cache)
+
+
+@pytest.mark.benchmark
+def test_benchmark_against_redis(app, memory_cache):
+    """Compare the in-memory backend with the Redis backend."""
+    redis_cache = IdentityRedisCache(app)
+    value = [(f"{i:032x}", "reader") for i in range(100)]
+
+    def run(cache):
+        def ops():
+            cache.set("user-communities:1", value)
+            cache.get("user-communities:1")
+
+        return timeit.timeit(ops, number=200)
+
+    memory_time = run(memory_cache)
+    redis_time = run(redis_cache)
+    print(f"memory: {memory_time:.4f}s, redis: {redis_time:.4f}s")
@@ -39,3 +39,36 @@ def test_timeout_config(app):
     current_identities_cache.set("foo_1", "bar")
     time.sleep(3)
     assert current_identities_cache.get("foo_1") is None
+
+
+def test_append_values(app):
+    """Test values are appended to a set."""
+    current_identities_cache.flush()
+    current_identities_cache.append("comm_1", 1)
+    current_identities_cache.append("comm_1", 1)
+    current_identities_cache.append_many(["comm_1", "comm_2"], 2)
+    assert sorted(current_identities_cache.values("comm_1")) == ["1", "2"]
+    assert current_identities_cache.values("comm_2") == ["2"]
+    assert current_identities_cache.values("comm_3") == []
+
+
+def test_delete_many(app):
+    """Test several keys are deleted at once."""
+    current_identities_cache.set("foo_1", "bar")
+    current_identities_cache.set("foo_2", "bar")
+    current_identities_cache.delete_many(["foo_1", "foo_2"])
+    assert current_identities_cache.get("foo_1") is None
+    assert current_identities_cache.get("foo_2") is None
+    # Deleting no keys is a no-op
+    current_identities_cache.delete_many([])
+
+
+def test_flush_epoch(app):
+    """Test flushing moves to a new epoch."""
+    epoch = current_identities_cache.epoch()
+    current_identities_cache.set("foo", "bar")
+    current_identities_cache.append("comm", 1)
+    current_identities_cache.flush()
+    assert current_identities_cache.epoch() == epoch + 1
+    assert current_identities_cache.get("foo") is None
+    assert current_identities_cache.values("comm") == []
@@ -0,0 +1,108 @@
+# SPDX-FileCopyrightText: 2026 CERN.
+# SPDX-License-Identifier: MIT
+
+"""Tiered identity cache tests."""
+
+import time
+
+import pytest
+
+from invenio_communities.cache.lru import LRUCache
+from invenio_communities.cache.redis import (
+    IdentityRedisCache,
+    IdentityTieredRedisCache,
+)
+from invenio_communities.utils import IDENTITY_KEY
+
+
+@pytest.fixture()
+def tiered_cache(app):
+    """Tiered identity cache."""
+    cache = IdentityTieredRedisCache(app)
+    cache.flush()
+    cache.sync(force=True)
+    return cache
+
+
+def test_lru_eviction_and_expiry():
+    """Test the local tier is bounded and expires entries."""
+    lru = LRUCache(maxsize=2, timeout=1)
+    lru.set("a", 1)
+    lru.set("b", 2)
+    assert lru.get("a") == 1
+    lru.set("c", 3)
+    # "b" is the least recently used entry
+    assert lru.get("b") is None
+    assert lru.get("a") == 1
+    time.sleep(1.1)
+    assert lru.get("a") is None
+
+
+def test_lru_stale_version():
+    """Test a value read before a clear is not stored."""
+    lru = LRUCache(maxsize=10, timeout=10)
+    version = lru.version
+    lru.clear()
+    assert lru.set("a", 1, version=version) is False
+    assert lru.get("a") is None
+
+
+def test_local_hit(tiered_cache):
+    """Test a local hit does not reach Redis."""
+    key = f"{IDENTITY_KEY}1"
+    tiered_cache.set(key, [("comm", "reader")])
+    # Remove the entry only from Redis
+    IdentityRedisCache.delete(tiered_cache, key)
+    assert tiered_cache.get(key) == [("comm", "reader")]
+
+
+def test_delete_both_tiers(tiered_cache):
+    """Test deletion invalidates both tiers."""
+    key = f"{IDENTITY_KEY}1"
+    tiered_cache.set(key, [("comm", "reader")])
+    tiered_cache.delete(key)
+    assert tiered_cache.local.get(key) is None
+    assert tiered_cache.get(key) is None
+
+
+def test_delete_from_other_worker(app, tiered_cache):
+    """Test deletion from another worker is synced to the local tier."""
+    key, other_key = f"{IDENTITY_KEY}1", f"{IDENTITY_KEY}2"
+    tiered_cache.set(key, [("comm", "reader")])
+    tiered_cache.set(other_key, [("comm", "reader")])
+    other_worker = IdentityTieredRedisCache(app)
+    other_worker.delete(key)
+    # Served locally until the next sync
+    assert tiered_cache.get(key) == [("comm", "reader")]
+    tiered_cache.sync(force=True)
+    assert tiered_cache.local.get(key) is None
+    assert tiered_cache.get(key) is None
+    # Only the deleted key is dropped
+    assert tiered_cache.local.get(other_key) == [("comm", "reader")]
+
+    other_worker.set(key, [("comm", "curator")])
+    assert tiered_cache.get(key) == [("comm", "curator")]
+
+
+def test_delete_nothing(tiered_cache):
+    """Test deleting no keys does not bump the invalidation log."""
+    version = tiered_cache.redis.get(tiered_cache._version_key)
+    tiered_cache.delete_many([])
+    tiered_cache.delete_many(["foo"])
+    assert tiered_cache.redis.get(tiered_cache._version_key) == version
+
+
+def test_flush_from_other_worker(app, tiered_cache):
+    """Test a flush from another worker clears the local tier."""
+    key = f"{IDENTITY_KEY}1"
+    tiered_cache.set(key, [("comm", "reader")])
+    IdentityTieredRedisCache(app).flush()
+    tiered_cache.sync(force=True)
+    assert tiered_cache.get(key) is None
+
+
+def test_non_identity_keys_bypass_local(tiered_cache):
+    """Test keys without the identity prefix are always read from Redis."""
+    tiered_cache.set("foo", "bar")
+    assert tiered_cache.local.get("foo") is None
+    assert tiered_cache.get("foo") == "bar"
@@ -0,0 +1,63 @@
+# SPDX-FileCopyrightText: 2026 CERN.
+# SPDX-License-Identifier: MIT
+
+"""Identity cache metrics tests."""
+
+from invenio_communities.cache.memory import IdentityMemoryCache
+from invenio_communities.cache.metrics import CacheMetrics
+from invenio_communities.cli import stats
+
+
+def test_counters_and_histograms():
+    """Test metrics are aggregated and passed to the hooks."""
+    recorded = []
+    metrics = CacheMetrics(hooks=[lambda *args: recorded.append(args)])
+    metrics.incr("gets")
+    metrics.incr("gets", 2)
+    metrics.observe("timing", 0.002)
+    snapshot = metrics.snapshot()
+    assert snapshot["gets"] == 3
+    assert snapshot["timing.count"] == 1
+    assert snapshot["timing.bucket.0.0025"] == 1
+    assert recorded == [
+        ("counter", "gets", 1),
+        ("counter", "gets", 2),
+        ("histogram", "timing", 0.002),
+    ]
+    metrics.reset()
+    assert metrics.snapshot() == {}
+
+
+def test_sink():
+    """Test pending metrics are passed to the sink."""
+    published = []
+    metrics = CacheMetrics(sink=published.append, interval=0)
+    metrics.incr("gets")
+    metrics.incr("hits")
+    assert published == [{"gets": 1}, {"hits": 1}]
+
+
+def test_cache_metrics(app):
+    """Test the cache operations are counted."""
+    cache = IdentityMemoryCache(app)
+    cache.get("foo")
+    cache.set("foo", "bar")
+    cache.get("foo")
+    cache.delete("foo")
+    cache.append_many(["comm_1", "comm_2"], 1)
+    cache.flush()
+    snapshot = cache.stats()
+    assert snapshot["gets"] == 2
+    assert snapshot["hits"] == 1
+    assert snapshot["misses"] == 1
+    assert snapshot["sets"] == 1
+    assert snapshot["deletes"] == 1
+    assert snapshot["appends"] == 2
+    assert snapshot["flushes"] == 1
+    assert snapshot["payload_bytes.read"] == snapshot["payload_bytes.written"]
+
+
+def test_stats_command(app, cli_runner):
+    """Test the stats command."""
+    result = cli_runner(stats)
+    assert result.exit_code == 0
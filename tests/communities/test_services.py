@@ -17,15 +17,22 @@ from invenio_pidstore.errors import PIDDoesNotExistError
 from invenio_records_resources.services.errors import PermissionDeniedError
 from marshmallow import ValidationError
 
+from invenio_communities.communities.records.api import Community
 from invenio_communities.communities.records.systemfields.deletion_status import (
     CommunityDeletionStatusEnum,
 )
+from invenio_communities.communities.services.links import (
+    CommunityEndpointLink,
+    CommunityLinksTemplate,
+)
 from invenio_communities.communities.services.service import get_cached_community_slug
 from invenio_communities.errors import (
     CommunityFeaturedEntryDoesNotExistError,
     DeletionStatusError,
 )
 from invenio_communities.fixtures.tasks import reindex_featured_entries
+from invenio_communities.generators import community_access_profile
+from invenio_communities.permissions import can_perform_action
 
 
 @pytest.fixture()
@@ -362,6 +369,41 @@ def test_search_user(
         community_service.search_user_communities(identity=anon_identity)
 
 
+def test_search_user_member_principals(
+    app,
+    db,
+    search_clear,
+    location,
+    community_service,
+    community,
+    members,
+    new_user,
+    set_app_config_fn_scoped,
+):
+    """Test searching the user communities on the indexed member principals."""
+    assert "member_principals" not in community._record.dumps()
+    set_app_config_fn_scoped({"COMMUNITIES_MEMBER_PRINCIPALS_FILTER": True})
+    community_service.indexer.index(community._record)
+    Community.index.refresh()
+    owner = members["owner"]
+    reader = members["reader"]
+
+    principals = community._record.dumps()["member_principals"]
+    assert f"owner:user:{owner.id}" in principals
+    assert f"reader:user:{reader.id}" in principals
+
+    for user in (owner, reader):
+        hits = community_service.search_user_communities(
+            identity=user.identity
+        ).to_dict()["hits"]["hits"]
+        assert [h["id"] for h in hits] == [str(community.id)]
+
+    hits = community_service.search_user_communities(
+        identity=new_user.identity
+    ).to_dict()["hits"]["hits"]
+    assert hits == []
+
+
 def test_search_community_requests(
     app,
     db,
@@ -758,3 +800,54 @@ def test_bulk_update_parent_overwrite(
     for c_id in children:
         c_comm = community_service.record_cls.pid.resolve(c_id)
         assert str(c_comm.parent.id) == str(parent_community.id)
+
+
+def test_links_expand_many(
+    app, community_service, community, restricted_community, owner, superuser_identity
+):
+    """Test expanding the links of several communities shares the decisions."""
+    links_tpl = community_service.links_item_tpl
+    communities = [community._record, restricted_community._record]
+    for identity in (owner.identity, superuser_identity, system_identity):
+        expected = [links_tpl.expand(identity, c) for c in communities]
+        assert links_tpl.expand_many(identity, communities) == expected
+    assert "featured" in links_tpl.expand_many(superuser_identity, communities)[1]
+
+
+def _update_links_tpl(community_service, when=can_perform_action):
+    """Links template with an action link for the "update" permission."""
+    return CommunityLinksTemplate(
+        {},
+        CommunityEndpointLink(
+            "communities.featured_create", when=when, params=["pid_value"]
+        ),
+        [{"action_name": "update", "action_permission": "update"}],
+        context={
+            "permission_policy_cls": community_service.config.permission_policy_cls
+        },
+    )
+
+
+def test_links_expand_many_same_profile(app, community_service, community, comm, owner):
+    """Test the decisions shared by communities of a profile are retargeted."""
+    communities = [community._record, comm._record]
+    assert community_access_profile(communities[0]) == (
+        community_access_profile(communities[1])
+    )
+    links_tpl = _update_links_tpl(community_service)
+    assert links_tpl.shares_decisions()
+
+    links = links_tpl.expand_many(owner.identity, communities)
+    assert links == [links_tpl.expand(owner.identity, c) for c in communities]
+    # Only the first community is owned by the identity
+    assert "update" in links[0]
+    assert "update" not in links[1]
+
+    # Any other link condition is evaluated for each community
+    links_tpl = _update_links_tpl(
+        community_service, when=lambda community, ctx: str(community.id) == str(comm.id)
+    )
+    assert not links_tpl.shares_decisions()
+    links = links_tpl.expand_many(system_identity, communities)
+    assert "update" not in links[0]
+    assert "update" in links[1]
@@ -7,8 +7,10 @@
 from flask import g
 from invenio_records_permissions.generators import SystemProcess
 
+from invenio_communities.generators import CommunityOwners
 from invenio_communities.permissions import CommunityPermissionPolicy
-from invenio_communities.views.communities import _filter_roles
+from invenio_communities.utils import check_community_permission, permission_decisions
+from invenio_communities.views.communities import _filter_roles, allowed_roles
 from invenio_communities.views.ui import _show_create_community_link
 
 
@@ -64,6 +66,60 @@ def test_filter_roles_when_adding_groups(
     )
 
 
+def test_allowed_roles(app, db, community_service, community, members):
+    """Test computing the allowed roles for several actions at once."""
+    actions = [
+        ("members_update", {"user", "group"}),
+        ("members_invite", {"user"}),
+        ("members_add", {"group"}),
+    ]
+    policy = community_service.config.permission_policy_cls
+    for role in app.config["COMMUNITIES_ROLES"]:
+        identity = members[role["name"]].identity
+        with app.test_request_context():
+            results = allowed_roles(community.id, actions, identity=identity)
+        for action_roles, (action, member_types) in zip(results, actions):
+            assert action_roles == [
+                r
+                for r in app.config["COMMUNITIES_ROLES"]
+                if policy(
+                    action,
+                    community_id=community.id,
+                    role=r["name"],
+                    member_types=member_types,
+                ).allows(identity)
+            ]
+
+
+def test_allowed_roles_custom_policy(app, db, community, members):
+    """Test a policy overriding an action is evaluated for each role."""
+
+    class CustomPolicy(CommunityPermissionPolicy):
+        can_members_invite = [CommunityOwners(), SystemProcess()]
+
+    actions = [("members_invite", {"user"}), ("members_add", {"group"})]
+    default_policy = app.config.get("COMMUNITIES_PERMISSION_POLICY")
+    app.config["COMMUNITIES_PERMISSION_POLICY"] = CustomPolicy
+    try:
+        with app.test_request_context():
+            invite, add = allowed_roles(
+                community.id, actions, identity=members["manager"].identity
+            )
+        with app.test_request_context():
+            owner_invite, _ = allowed_roles(
+                community.id, actions, identity=members["owner"].identity
+            )
+    finally:
+        if default_policy is None:
+            del app.config["COMMUNITIES_PERMISSION_POLICY"]
+        else:
+            app.config["COMMUNITIES_PERMISSION_POLICY"] = default_policy
+
+    assert invite == []
+    assert {r["name"] for r in add} == {"manager", "curator", "reader"}
+    assert owner_invite == app.config["COMMUNITIES_ROLES"]
+
+
 def test_show_create_community_link(app, users, superuser_identity):
     """Test the _can_create_community function under different config settings."""
     test_users = ["reader", "curator", "manager", "owner"]
@@ -92,3 +148,31 @@ def test_show_create_community_link(app, users, superuser_identity):
     # Test superuser
     g.identity = superuser_identity
     assert _show_create_community_link() == True
+
+
+def test_permission_decisions(app, users):
+    """Test permission decisions are memoized for the request."""
+    identity = users["reader"].identity
+    calls = []
+
+    def evaluate():
+        calls.append(1)
+        return True
+
+    community = {"id": "comm", "revision_id": 1}
+    with app.test_request_context():
+        for _ in range(3):
+            assert check_community_permission(identity, "read", community, evaluate)
+        assert check_community_permission(identity, "create", evaluate=evaluate)
+        # A new revision of the community is evaluated again
+        community["revision_id"] = 2
+        assert check_community_permission(identity, "read", community, evaluate)
+
+        decisions = permission_decisions()
+        assert (decisions.hits, decisions.misses) == (2, 3)
+        assert len(calls) == 3
+
+    # Decisions are not shared between requests
+    with app.test_request_context():
+        assert check_community_permission(identity, "read", community, evaluate)
+        assert len(calls) == 4
@@ -8,10 +8,13 @@ See https://pytest-invenio.readthedocs.io/ for documentation on which test
 fixtures are available.
 """
 
+from contextlib import contextmanager
+
 import pytest
 from invenio_access.permissions import system_identity
 from invenio_requests.records.api import Request
 from invenio_search import current_search
+from sqlalchemy import event
 
 from invenio_communities.members.records.api import ArchivedInvitation, Member
 
@@ -19,6 +22,34 @@ from invenio_communities.members.records.api import ArchivedInvitation, Member
 #
 # Function scope
 #
+@pytest.fixture(scope="function")
+def count_queries(db):
+    """Record the SQL statements executed within a block.
+
+    Only the statements starting with the given prefix are recorded:
+
+        with count_queries("UPDATE communities_members ") as updates:
+            ...
+        assert len(updates) == 1
+    """
+
+    @contextmanager
+    def _count_queries(prefix=""):
+        statements = []
+
+        def before_cursor_execute(conn, cursor, statement, *args):
+            if statement.startswith(prefix):
+                statements.append(statement)
+
+        event.listen(db.engine, "before_cursor_execute", before_cursor_execute)
+        try:
+            yield statements
+        finally:
+            event.remove(db.engine, "before_cursor_execute", before_cursor_execute)
+
+    return _count_queries
+
+
 @pytest.fixture(scope="function")
 def clean_index(member_service, requests_service, db):
     """Clean the member and request index to match database state.
@@ -0,0 +1,32 @@
+# SPDX-FileCopyrightText: 2026 CERN.
+# SPDX-License-Identifier: MIT
+
+"""Test the adapter to the upstream internals."""
+
+from importlib.metadata import version
+
+import pytest
+from invenio_indexer.api import RecordIndexer
+from invenio_requests.records.api import Request, RequestEvent
+from packaging.version import Version
+
+from invenio_communities.members.records.api import Member
+from invenio_communities.members.services.compat import UPSTREAM_VERSIONS
+
+
+@pytest.mark.parametrize("package", sorted(UPSTREAM_VERSIONS))
+def test_upstream_versions(package):
+    """Test the installed upstream packages are the ones the adapter supports."""
+    lower, upper = UPSTREAM_VERSIONS[package]
+    assert Version(lower) <= Version(version(package)) < Version(upper)
+
+
+def test_upstream_internals():
+    """Test the upstream internals used by the adapter exist."""
+    indexer = RecordIndexer()
+    assert callable(indexer._prepare_index)
+    assert callable(indexer._prepare_record)
+    assert indexer._version_type == "external_gte"
+    for record_cls in (Member, Request, RequestEvent):
+        assert isinstance(record_cls._extensions, list)
+        assert callable(record_cls._validate)
@@ -3,10 +3,21 @@
 
 """Test components."""
 
+from flask import session
+from flask_principal import Identity
 from invenio_access.permissions import system_identity
+from invenio_accounts.models import Role
+from invenio_accounts.proxies import current_datastore, current_db_change_history
 
 from invenio_communities.proxies import current_identities_cache
-from invenio_communities.utils import identity_cache_key
+from invenio_communities.utils import (
+    get_community_roles,
+    group_cache_key,
+    identity_cache_key,
+    load_community_needs,
+    on_datastore_post_commit,
+    warm_identities_cache,
+)
 
 
 def test_accept_invite_cache_clear(
@@ -170,3 +181,113 @@ def test_group_actions_cache_clear(
     admin.refresh()
     community_roles = current_identities_cache.get(cache_key)
     assert len(community_roles) == 0
+
+
+def test_warm_identities_cache(member_service, community, new_user, db, search_clear):
+    """Test that the cache entries of several users are pre-populated."""
+    add_data = {
+        "members": [{"type": "user", "id": str(new_user.id)}],
+        "role": "reader",
+    }
+    member_service.add(system_identity, community._record.id, add_data)
+    current_identities_cache.flush()
+    cache_key = identity_cache_key(new_user.identity)
+    assert current_identities_cache.get(cache_key) is None
+
+    assert warm_identities_cache([new_user.id]) == 1
+    community_roles = current_identities_cache.get(cache_key)
+    assert community_roles["managed_only"]
+    assert get_community_roles(new_user.identity, []) == [
+        (str(community._record.id), "reader")
+    ]
+    assert current_identities_cache.values(str(community._record.id)) == [
+        str(new_user.id)
+    ]
+
+    # Warmed entries are a miss for users with unmanaged groups
+    role = Role(id="warm-unmanaged", name="warm-unmanaged", is_managed=False)
+    db.session.add(role)
+    db.session.commit()
+    member_service.add(
+        system_identity,
+        community._record.id,
+        {"members": [{"type": "group", "id": role.id}], "role": "curator"},
+    )
+    warm_identities_cache([new_user.id])
+    community_roles = get_community_roles(new_user.identity, [role.id])
+    assert sorted(r for _, r in community_roles) == ["curator", "reader"]
+    assert current_identities_cache.values(group_cache_key(role.id)) == [
+        str(new_user.id)
+    ]
+
+
+def test_datastore_post_commit_cache_clear(app, any_user, new_user, group, db):
+    """Test that the cached entries of changed users and role members are cleared."""
+    current_datastore.add_role_to_user(any_user.user, group)
+    db.session.commit()
+    any_user.refresh()
+    new_user.refresh()
+    any_user_key = identity_cache_key(any_user.identity)
+    new_user_key = identity_cache_key(new_user.identity)
+    assert current_identities_cache.get(any_user_key) is not None
+    assert current_identities_cache.get(new_user_key) is not None
+
+    session = object()
+    current_db_change_history.add_updated_user(id(session), new_user.id)
+    current_db_change_history.add_deleted_role(id(session), group.id)
+    try:
+        on_datastore_post_commit(None, session)
+    finally:
+        current_db_change_history.clear_dirty_sets(session)
+
+    assert current_identities_cache.get(any_user_key) is None
+    assert current_identities_cache.get(new_user_key) is None
+
+
+def test_datastore_post_commit_no_users(app, db, monkeypatch):
+    """Test the cache is not touched if no user was changed."""
+    role = Role(id="no-members", name="no-members")
+    db.session.add(role)
+    db.session.commit()
+    calls = []
+    monkeypatch.setattr(
+        current_identities_cache._get_current_object(),
+        "delete_many",
+        lambda keys: calls.append(keys),
+    )
+
+    session = object()
+    current_db_change_history.add_deleted_role(id(session), role.id)
+    try:
+        on_datastore_post_commit(None, session)
+    finally:
+        current_db_change_history.clear_dirty_sets(session)
+
+    assert calls == []
+
+
+def test_unmanaged_group_add_cache_clear(
+    app, member_service, community, new_user, any_user, db, search_clear
+):
+    """Test that only the identities of an unmanaged group are cleared on add."""
+    role = Role(id="unmanaged-group", name="unmanaged-group", is_managed=False)
+    db.session.add(role)
+    db.session.commit()
+    current_identities_cache.flush()
+
+    with app.test_request_context():
+        session["unmanaged_roles_ids"] = [role.id]
+        load_community_needs(Identity(new_user.id))
+    any_user.refresh()
+    new_user_key = identity_cache_key(new_user.identity)
+    any_user_key = identity_cache_key(any_user.identity)
+    assert current_identities_cache.get(new_user_key) == []
+    assert current_identities_cache.get(any_user_key) is not None
+
+    data = {
+        "members": [{"type": "group", "id": role.id}],
+        "role": "reader",
+    }
+    member_service.add(system_identity, community._record.id, data)
+    assert current_identities_cache.get(new_user_key) is None
+    assert current_identities_cache.get(any_user_key) is not None
@@ -5,17 +5,23 @@
 
 """Test community member service."""
 
+import io
+import json
+
 import pytest
-from invenio_access.permissions import system_identity
+from invenio_access.permissions import authenticated_user, system_identity
+from invenio_access.utils import get_identity
 from invenio_accounts.proxies import current_datastore
 from invenio_cache import current_cache
 from invenio_records_resources.services.errors import PermissionDeniedError
 from invenio_requests.records.api import Request, RequestEvent
 from marshmallow import ValidationError
 
+from invenio_communities.generators import CommunityRoleNeed
 from invenio_communities.members.errors import AlreadyMemberError, InvalidMemberError
 from invenio_communities.members.records.api import Member, MemberMixin
 from invenio_communities.proxies import current_identities_cache
+from invenio_communities.utils import identity_cache_key, load_community_needs
 
 
 #
@@ -90,6 +96,178 @@ def test_add_duplicate(member_service, community, owner, group, db):
     )
 
 
+def test_add_bulk(member_service, community, group, create_user, db, count_queries):
+    """Test members are added with a single insert, reporting duplicates."""
+    users = [
+        create_user(data={"email": f"bulk_{i}@example.org", "username": f"bulk_{i}"})
+        for i in range(3)
+    ]
+    data = {
+        "members": [{"type": "user", "id": str(users[0].id)}],
+        "role": "reader",
+    }
+    member_service.add(system_identity, community._record.id, data)
+
+    data = {
+        "members": [
+            {"type": "group", "id": group.name},
+            {"type": "user", "id": str(users[0].id)},
+            {"type": "user", "id": str(users[1].id)},
+            {"type": "user", "id": str(users[1].id)},
+            {"type": "user", "id": str(users[2].id)},
+        ],
+        "role": "curator",
+    }
+    # Duplicates fail the whole batch by default
+    pytest.raises(
+        AlreadyMemberError,
+        member_service.add,
+        system_identity,
+        community._record.id,
+        data,
+    )
+
+    errors = []
+    with count_queries("INSERT INTO communities_members") as inserts:
+        assert member_service.add(
+            system_identity, community._record.id, data, errors=errors
+        )
+
+    assert len(inserts) == 1
+    assert [e["member"]["id"] for e in errors] == [
+        str(users[0].id),
+        str(users[1].id),
+    ]
+    res = member_service.search(
+        system_identity, community._record.id, params={"facets": {"role": ["curator"]}}
+    ).to_dict()
+    assert res["hits"]["total"] == 3
+
+
+def test_import_members(member_service, community, group, create_user, db):
+    """Test a members import is processed in chunks, with per-row results."""
+    users = [
+        create_user(
+            data={"email": f"import_{i}@example.org", "username": f"import_{i}"}
+        )
+        for i in range(3)
+    ]
+    data = {
+        "members": [{"type": "user", "id": str(users[0].id)}],
+        "role": "reader",
+    }
+    member_service.add(system_identity, community._record.id, data)
+
+    lines = [
+        {"type": "user", "id": str(users[0].id), "role": "reader"},
+        {"type": "user", "id": str(users[1].id), "role": "reader"},
+        {"type": "user", "role": "reader"},
+        {"type": "user", "id": str(users[2].id), "role": "curator"},
+        {"type": "group", "id": group.name, "role": "reader"},
+        {"type": "user", "id": str(users[1].id), "role": "invalid"},
+    ]
+    stream = io.BytesIO("\n".join(json.dumps(line) for line in lines).encode())
+    job = member_service.import_members(
+        system_identity, community._record.id, stream, "application/x-ndjson"
+    )
+    assert job["total"] == 6
+
+    # The job is processed by the (eager) task once submitted
+    job = member_service.read_import(system_identity, community._record.id, job["id"])
+    assert job["status"] == "completed"
+    assert job["processed"] == 6
+    assert job["stats"] == {"succeeded": 3, "skipped": 1, "failed": 2}
+    assert {r["row"]: r["status"] for r in job["results"]} == {
+        1: "skipped",
+        3: "failed",
+        6: "failed",
+    }
+    res = member_service.search(system_identity, community._record.id).to_dict()
+    assert res["hits"]["total"] == 5
+
+    with pytest.raises(ValidationError):
+        member_service.import_members(
+            system_identity, community._record.id, io.BytesIO(b""), "text/csv"
+        )
+
+
+def test_import_members_retries(
+    app, member_service, community, create_user, db, monkeypatch
+):
+    """Test the retries of a rejected import chunk are bounded."""
+    users = [
+        create_user(data={"email": f"retry_{i}@example.org", "username": f"retry_{i}"})
+        for i in range(3)
+    ]
+    lines = [{"type": "user", "id": str(u.id), "role": "reader"} for u in users]
+    lines.insert(1, {"type": "group", "id": "unknown-group", "role": "reader"})
+
+    def import_lines():
+        stream = io.BytesIO("\n".join(json.dumps(line) for line in lines).encode())
+        job = member_service.import_members(
+            system_identity, community._record.id, stream, "application/x-ndjson"
+        )
+        return member_service.read_import(
+            system_identity, community._record.id, job["id"]
+        )
+
+    # Without retries, the whole chunk fails with its error
+    monkeypatch.setitem(app.config, "COMMUNITIES_MEMBERS_IMPORT_MAX_RETRIES", 0)
+    job = import_lines()
+    assert job["stats"] == {"succeeded": 0, "failed": 4}
+    assert len({r["message"] for r in job["results"]}) == 1
+
+    # With retries, the rejected entry is isolated
+    monkeypatch.setitem(app.config, "COMMUNITIES_MEMBERS_IMPORT_MAX_RETRIES", 4)
+    job = import_lines()
+    assert job["stats"] == {"succeeded": 3, "failed": 1}
+    assert [r["row"] for r in job["results"]] == [2]
+
+
+def test_import_members_as_user(member_service, community, owner, create_user, db):
+    """Test a members import runs with the identity of its submitter."""
+    users = [
+        create_user(
+            data={"email": f"invite_{i}@example.org", "username": f"invite_{i}"}
+        )
+        for i in range(2)
+    ]
+    cache_key = identity_cache_key(owner.identity)
+    current_identities_cache.delete(cache_key)
+    stream = io.BytesIO(
+        "type,id,role\n"
+        f"user,{users[0].id},reader\n"
+        f"user,{users[1].id},owner\n"
+        f"group,{users[1].id},reader\n".encode()
+    )
+    job = member_service.import_members(
+        owner.identity, community._record.id, stream, "text/csv", action="invite"
+    )
+    job = member_service.read_import(owner.identity, community._record.id, job["id"])
+    assert job["status"] == "completed"
+    assert job["stats"] == {"succeeded": 2, "failed": 1}
+    assert [r["row"] for r in job["results"]] == [3]
+    # The memberships of the submitter, resolved without their unmanaged
+    # groups, are not cached
+    assert current_identities_cache.get(cache_key) is None
+
+    # A job whose submitter is gone is not run as the system
+    job_cls = member_service.import_job_cls
+    job = job_cls(
+        community_id=community._record.id,
+        user_id=None,
+        action="add",
+        entries=[{"row": 1, "type": "user", "id": str(users[0].id), "role": "reader"}],
+        total=1,
+    )
+    db.session.add(job)
+    db.session.commit()
+    member_service.process_import(job.id)
+    job = member_service.read_import(system_identity, community._record.id, job.id)
+    assert job["status"] == "failed"
+    assert job["processed"] == 0
+
+
 def test_add_invalid_member_type(member_service, community, owner, new_user, db):
     """Only system identity can add a denied member type."""
     data = {
@@ -206,6 +384,42 @@ def test_invite(member_service, community, owner, new_user, db):
     )
 
 
+def test_invite_bulk(member_service, community, owner, create_user, db, count_queries):
+    """Test users are invited in a batch, reporting duplicates."""
+    users = [
+        create_user(data={"email": f"inv_{i}@example.org", "username": f"inv_{i}"})
+        for i in range(3)
+    ]
+    data = {
+        "members": [{"type": "user", "id": str(users[0].id)}],
+        "role": "reader",
+    }
+    member_service.invite(owner.identity, community._record.id, data)
+
+    data = {
+        "members": [{"type": "user", "id": str(u.id)} for u in users],
+        "role": "reader",
+        "message": "Welcome",
+    }
+    errors = []
+    with count_queries("INSERT INTO communities_members") as inserts:
+        assert member_service.invite(
+            owner.identity, community._record.id, data, errors=errors
+        )
+
+    assert len(inserts) == 1
+    assert [e["member"]["id"] for e in errors] == [str(users[0].id)]
+    res = member_service.search_invitations(
+        owner.identity, community._record.id
+    ).to_dict()
+    assert res["hits"]["total"] == 3
+    for hit in res["hits"]["hits"]:
+        request_id = hit["request"]["id"]
+        if hit["member"]["id"] != str(users[0].id):
+            events = RequestEvent.model_cls.query.filter_by(request_id=request_id)
+            assert events.count() == 1
+
+
 def test_invite_group_denied(member_service, community, owner, group, db):
     """Invite a group."""
     # Groups cannot be invited (groups cannot receive invitation request)
@@ -491,6 +705,53 @@ def test_read_memberships(
     assert member_service.read_memberships(anon_identity) == {"memberships": []}
 
 
+def test_get_memberships_single_query(
+    member_service, community, any_user, group, db, count_queries
+):
+    """Memberships through users, groups and extra group ids take one query."""
+    member_service.add(
+        system_identity,
+        community._record.id,
+        {"members": [{"type": "user", "id": str(any_user.id)}], "role": "reader"},
+    )
+    member_service.add(
+        system_identity,
+        community._record.id,
+        {"members": [{"type": "group", "id": group.name}], "role": "curator"},
+    )
+    current_datastore.add_role_to_user(any_user.user, group)
+    db.session.commit()
+
+    with count_queries() as statements:
+        memberships = Member.get_memberships(
+            any_user.identity, group_ids=["unmanaged-group"]
+        )
+
+    assert len(statements) == 1
+    assert sorted(memberships) == [
+        (str(community._record.id), "curator"),
+        (str(community._record.id), "reader"),
+    ]
+
+
+def test_rebuild_index(member_service, community, members, db):
+    """Test the members of a community are reindexed in chunks."""
+    progress = []
+    member_service.rebuild_index(
+        system_identity,
+        community_id=community._record.id,
+        chunk_size=2,
+        progress=lambda name, count: progress.append((name, count)),
+    )
+    count = Member.model_cls.query.filter_by(
+        community_id=community._record.id, is_deleted=False
+    ).count()
+    assert [c for name, c in progress if name == "members"] == [
+        *range(2, count, 2),
+        count,
+    ]
+
+
 #
 # Search invitations
 #
@@ -596,6 +857,39 @@ def test_invite_cancel_flow(
     assert res.to_dict()["hits"]["total"] == 1
 
 
+def test_invite_lazy_needs(
+    app,
+    requests_service,
+    community,
+    owner,
+    invite_request_id,
+    set_app_config_fn_scoped,
+    db,
+    clean_index,
+):
+    """Test the requests policies see the lazily resolved community needs."""
+    set_app_config_fn_scoped({"COMMUNITIES_IDENTITIES_LAZY_NEEDS": True})
+    with app.test_request_context():
+        identity = get_identity(owner.user)
+        identity.provides.add(authenticated_user)
+        load_community_needs(identity)
+        resolver = identity.community_needs_resolver
+        assert not resolver.complete
+
+        # Searches resolve all community needs
+        res = requests_service.search(identity, type="community-invitation")
+        assert res.to_dict()["hits"]["total"] == 1
+        assert resolver.complete
+
+    with app.test_request_context():
+        identity = get_identity(owner.user)
+        identity.provides.add(authenticated_user)
+        load_community_needs(identity)
+        # The community needs are resolved by the entity proxy
+        requests_service.execute_action(identity, invite_request_id, "cancel")
+        assert CommunityRoleNeed(str(community.id), "owner") in identity.provides
+
+
 def test_invite_actions_permissions(
     db,
     requests_service,
@@ -800,6 +1094,33 @@ def test_delete_invalid_member(member_service, community, owner):
     )
 
 
+def test_delete_bulk(
+    member_service, community, owner, group, create_user, db, count_queries
+):
+    """Test members are deleted with a single statement."""
+    users = [
+        create_user(
+            data={"email": f"delete_{i}@example.org", "username": f"delete_{i}"}
+        )
+        for i in range(3)
+    ]
+    members = [{"type": "user", "id": str(u.id)} for u in users]
+    members.append({"type": "group", "id": group.name})
+    data = {"members": members, "role": "reader"}
+    member_service.add(system_identity, community._record.id, data)
+
+    with count_queries("DELETE FROM communities_members ") as deletes:
+        member_service.delete(
+            owner.identity, community._record.id, {"members": members}
+        )
+
+    assert len(deletes) == 1
+    assert Member.get_members(community._record.id, members=members) == []
+    Member.index.refresh()
+    res = member_service.search(system_identity, community._record.id).to_dict()
+    assert res["hits"]["total"] == 1
+
+
 #
 # Update self
 #
@@ -1139,6 +1460,45 @@ def test_update_role_must_have_owner(member_service, community, owner, group, db
     )
 
 
+def test_update_bulk(
+    member_service, community, owner, group, create_user, db, count_queries
+):
+    """Test members are updated with a single statement and version bump."""
+    users = [
+        create_user(
+            data={"email": f"update_{i}@example.org", "username": f"update_{i}"}
+        )
+        for i in range(3)
+    ]
+    members = [{"type": "user", "id": str(u.id)} for u in users]
+    members.append({"type": "group", "id": group.name})
+    data = {"members": members, "role": "reader"}
+    member_service.add(system_identity, community._record.id, data)
+    before = {
+        m.id: m.revision_id
+        for m in Member.get_members(community._record.id, members=members)
+    }
+
+    with count_queries("UPDATE communities_members ") as updates:
+        member_service.update(
+            owner.identity,
+            community._record.id,
+            {"members": members, "role": "curator"},
+            refresh=True,
+        )
+
+    assert len(updates) == 1
+    updated = Member.get_members(community._record.id, members=members)
+    assert {m.role for m in updated} == {"curator"}
+    assert {m.id: m.revision_id for m in updated} == {
+        id_: revision_id + 1 for id_, revision_id in before.items()
+    }
+    res = member_service.search(
+        system_identity, community._record.id, params={"facets": {"role": ["curator"]}}
+    ).to_dict()
+    assert res["hits"]["total"] == 4
+
+
 def test_update_invalid_data(member_service, community, group):
     # No role or visibility
     data = {
@@ -8,17 +8,29 @@ CommunityPermissionPolicy is defined at the top-level, the test are defined ther
 """
 
 import copy
+import timeit
 
 import pytest
 from flask_principal import Identity
 from invenio_access.permissions import system_identity
+from invenio_records_permissions.api import permission_filter
+from invenio_records_permissions.generators import AnyUser, SystemProcess
 from invenio_requests.services.permissions import (
     PermissionPolicy as RequestPermissionPolicy,
 )
+from invenio_search import current_search_client
+from invenio_search.engine import dsl
 
-from invenio_communities.generators import CommunityRoleNeed
+from invenio_communities.communities.records.api import Community
+from invenio_communities.generators import (
+    CommunityRoleNeed,
+    IfRestrictedBase,
+    community_access_profile,
+    community_needs_index,
+)
 from invenio_communities.members import Member
 from invenio_communities.permissions import CommunityPermissionPolicy
+from invenio_communities.utils import load_community_needs
 
 
 def test_can_request_membership(
@@ -280,3 +292,192 @@ def test_can_perform_actions_on_membership_request(
         ).allows(identity_actor)
         is allowed_or_not
     )
+
+
+def test_community_needs_index(app):
+    """Test the community needs index follows the needs of an identity."""
+    identity = Identity(1)
+    identity.provides.add(CommunityRoleNeed("comm_1", "owner"))
+    identity.provides.add(CommunityRoleNeed("comm_2", "reader"))
+    index = community_needs_index(identity)
+    assert sorted(index.communities()) == ["comm_1", "comm_2"]
+    assert index.communities(role="owner") == ["comm_1"]
+    assert index.has_role("comm_2", "reader")
+    assert not index.has_role("comm_2", "owner")
+    assert community_needs_index(identity) is index
+
+    # Needs added afterwards are taken into account
+    identity.provides.add(CommunityRoleNeed("comm_3", "owner"))
+    index = community_needs_index(identity)
+    assert sorted(index.communities(role="owner")) == ["comm_1", "comm_3"]
+
+
+def test_lazy_community_needs(
+    app, restricted_community, owner, any_user, set_app_config_fn_scoped
+):
+    """Test community needs are only resolved once a permission checks them."""
+    set_app_config_fn_scoped({"COMMUNITIES_IDENTITIES_LAZY_NEEDS": True})
+    community_id = str(restricted_community.id)
+
+    with app.test_request_context():
+        identity = Identity(owner.id)
+        load_community_needs(identity)
+    assert identity.community_needs_resolver
+    assert not [n for n in identity.provides if n.method == "community"]
+
+    policy = CommunityPermissionPolicy
+    assert policy("read", record=restricted_community._record).allows(identity)
+    assert CommunityRoleNeed(community_id, "owner") in identity.provides
+    assert not policy("read", record=restricted_community._record).allows(
+        any_user.identity
+    )
+
+    # Search filters resolve all the community needs
+    assert community_needs_index(identity).communities() == [community_id]
+
+
+def test_compiled_policy(app, community, owner, any_user, anon_identity):
+    """Test compiled policies decide like the uncompiled ones."""
+
+    class UncompiledPolicy(CommunityPermissionPolicy):
+        compiled = False
+
+    actions = [
+        name[len("can_") :]
+        for name in dir(CommunityPermissionPolicy)
+        if name.startswith("can_")
+    ]
+    record = community._record
+    identities = [owner.identity, any_user.identity, anon_identity, system_identity]
+
+    def check_all(policy):
+        return [
+            policy(action, record=record, role="reader").allows(identity)
+            for action in actions
+            for identity in identities
+        ]
+
+    def needs_all(policy):
+        permissions = [
+            policy(action, record=record, role="reader") for action in actions
+        ]
+        return [(p.needs, p.excludes) for p in permissions]
+
+    assert check_all(CommunityPermissionPolicy) == check_all(UncompiledPolicy)
+    assert needs_all(CommunityPermissionPolicy) == needs_all(UncompiledPolicy)
+
+
+def test_compiled_policy_other_fields(
+    community_service, community, owner, any_user, minimal_community
+):
+    """Test generators on fields outside of the profile are not compiled."""
+    data = copy.deepcopy(minimal_community)
+    data["slug"] = "other-title"
+    data["metadata"]["title"] = "Other"
+    other = community_service.create(owner.identity, data)
+    assert community_access_profile(community._record) == (
+        community_access_profile(other._record)
+    )
+
+    class IfTitle(IfRestrictedBase):
+        def __init__(self, then_, else_):
+            super().__init__(
+                lambda r: r["metadata"]["title"],
+                "metadata.title",
+                "Other",
+                "My Community",
+                then_,
+                else_,
+            )
+
+    class Policy(CommunityPermissionPolicy):
+        can_custom = [IfTitle(then_=[AnyUser()], else_=[SystemProcess()])]
+
+    assert not Policy("custom", record=community._record).allows(any_user.identity)
+    assert Policy("custom", record=other._record).allows(any_user.identity)
+
+
+@pytest.mark.benchmark
+def test_benchmark_compiled_policy(app, community, owner, any_user, anon_identity):
+    """Compare compiled and uncompiled policies over all the actions."""
+
+    class UncompiledPolicy(CommunityPermissionPolicy):
+        compiled = False
+
+    actions = [
+        name[len("can_") :]
+        for name in dir(CommunityPermissionPolicy)
+        if name.startswith("can_")
+    ]
+    record = community._record
+    identities = [owner.identity, any_user.identity, anon_identity, system_identity]
+
+    def check_all(policy):
+        return [
+            policy(action, record=record, role="reader").allows(identity)
+            for action in actions
+            for identity in identities
+        ]
+
+    compiled_time = timeit.timeit(
+        lambda: check_all(CommunityPermissionPolicy), number=20
+    )
+    uncompiled_time = timeit.timeit(lambda: check_all(UncompiledPolicy), number=20)
+    print(f"compiled: {compiled_time:.4f}s, uncompiled: {uncompiled_time:.4f}s")
+
+
+def test_compiled_query_filters(
+    app, community, restricted_community, owner, any_user, anon_identity
+):
+    """Test compiled query filters match the same communities."""
+
+    class UncompiledPolicy(CommunityPermissionPolicy):
+        compiled = False
+
+    actions = ["read", "read_deleted", "featured_search", "submit_record"]
+    identities = [owner.identity, any_user.identity, anon_identity, system_identity]
+
+    def search_ids(policy, action, identity):
+        query = permission_filter(policy(action, identity=identity))
+        search = dsl.Search(
+            using=current_search_client, index=Community.index.search_alias
+        )
+        return sorted(hit.meta.id for hit in search.filter(query).scan())
+
+    for action in actions:
+        for identity in identities:
+            assert search_ids(CommunityPermissionPolicy, action, identity) == (
+                search_ids(UncompiledPolicy, action, identity)
+            )
+
+    # Branches are collapsed for system processes
+    query = permission_filter(
+        CommunityPermissionPolicy("read", identity=system_identity)
+    )
+    assert query == dsl.Q("match_all")
+
+
+@pytest.mark.benchmark
+def test_benchmark_compiled_query_filters(
+    app, community, owner, any_user, anon_identity
+):
+    """Compare compiled and uncompiled query filters."""
+
+    class UncompiledPolicy(CommunityPermissionPolicy):
+        compiled = False
+
+    actions = ["read", "read_deleted", "featured_search", "submit_record"]
+    identities = [owner.identity, any_user.identity, anon_identity, system_identity]
+
+    def filter_all(policy):
+        return [
+            policy(action, identity=identity).query_filters
+            for action in actions
+            for identity in identities
+        ]
+
+    compiled_time = timeit.timeit(
+        lambda: filter_all(CommunityPermissionPolicy), number=20
+    )
+    uncompiled_time = timeit.timeit(lambda: filter_all(UncompiledPolicy), number=20)
+    print(f"compiled: {compiled_time:.4f}s, uncompiled: {uncompiled_time:.4f}s")
@@ -0,0 +1,152 @@
+# SPDX-FileCopyrightText: 2026 CERN.
+# SPDX-License-Identifier: MIT
+
+"""Role registry tests."""
+
+import timeit
+
+import pytest
+
+from invenio_communities.config import COMMUNITIES_ROLES
+from invenio_communities.generators import (
+    AuthenticatedUserButNotCommunityMember,
+    CommunityCurators,
+    CommunityManagers,
+    CommunityManagersForRole,
+    CommunityMembers,
+)
+from invenio_communities.roles import RoleRegistry
+
+
+class LinearRoleRegistry(RoleRegistry):
+    """Role registry scanning the list of roles on each call."""
+
+    def __contains__(self, key):
+        """Determine if key is a valid role id."""
+        return any(key == role.name for role in self.roles)
+
+    def __getitem__(self, key):
+        """Get a role for a specific key."""
+        for role in self.roles:
+            if key == role.name:
+                return role
+        raise KeyError(key)
+
+    @property
+    def names(self):
+        """Get the names of all roles."""
+        return tuple(role.name for role in self.roles)
+
+    def can(self, action):
+        """Returns the roles that can do the action."""
+        return (role for role in self.roles if getattr(role, f"can_{action}"))
+
+    def names_can(self, action):
+        """Returns the names of the roles that can do the action."""
+        return tuple(role.name for role in self.can(action))
+
+    def manager_roles(self, role_name):
+        """Get all roles that can manage members a given role."""
+        return [role for role in self.roles if role.can_manage_role(role_name)]
+
+    def manager_role_names(self, role_name):
+        """Get the names of all roles that can manage members a given role."""
+        return tuple(role.name for role in self.manager_roles(role_name))
+
+
+def test_registry_tables():
+    """Test the precomputed tables match scanning the roles."""
+    registry = RoleRegistry(COMMUNITIES_ROLES)
+    linear = LinearRoleRegistry(COMMUNITIES_ROLES)
+
+    assert registry.names == linear.names
+    for name in linear.names + ("unknown",):
+        assert (name in registry) == (name in linear)
+        assert registry.manager_roles(name) == tuple(linear.manager_roles(name))
+        assert registry.manager_role_names(name) == linear.manager_role_names(name)
+    for action in ("manage", "curate", "view"):
+        assert list(registry.can(action)) == list(linear.can(action))
+        assert registry.names_can(action) == linear.names_can(action)
+    assert registry["owner"] is registry.owner_role
+
+
+class Member:
+    """Member stub."""
+
+    def __init__(self, role):
+        """Constructor."""
+        self.role = role
+
+
+class Record:
+    """Community record stub."""
+
+    id = "comm"
+
+
+def test_permission_evaluation(app):
+    """Test the generators give the same needs with a linear role registry."""
+    generators = [
+        AuthenticatedUserButNotCommunityMember(),
+        CommunityMembers(),
+        CommunityCurators(),
+        CommunityManagers(),
+        CommunityManagersForRole(),
+    ]
+    role_names = [role["name"] for role in COMMUNITIES_ROLES]
+
+    def evaluate():
+        return [
+            (
+                set(generator.needs(record=Record(), role=role, member=Member(old))),
+                set(generator.excludes(record=Record(), role=role, member=Member(old))),
+            )
+            for generator in generators
+            for role in role_names
+            for old in role_names
+        ]
+
+    def run(registry):
+        app.extensions["invenio-communities"].roles_registry = registry
+        return evaluate()
+
+    registry = app.extensions["invenio-communities"].roles_registry
+    try:
+        linear = run(LinearRoleRegistry(COMMUNITIES_ROLES))
+        precomputed = run(RoleRegistry(COMMUNITIES_ROLES))
+    finally:
+        app.extensions["invenio-communities"].roles_registry = registry
+    assert precomputed == linear
+    # Excludes are computed for the community record
+    assert any(excludes for _, excludes in precomputed)
+
+
+@pytest.mark.benchmark
+def test_benchmark_permission_evaluation(app):
+    """Compare the permission generators with and without precomputed tables."""
+    generators = [
+        AuthenticatedUserButNotCommunityMember(),
+        CommunityMembers(),
+        CommunityCurators(),
+        CommunityManagers(),
+        CommunityManagersForRole(),
+    ]
+    kwargs = {"record": Record(), "role": "reader", "member": Member("curator")}
+
+    def evaluate():
+        for generator in generators:
+            generator.needs(**kwargs)
+            generator.excludes(**kwargs)
+
+    def run(registry):
+        app.extensions["invenio-communities"].roles_registry = registry
+        evaluate()
+        return timeit.timeit(evaluate, number=2000)
+
+    registry = app.extensions["invenio-communities"].roles_registry
+    try:
+        linear_time = run(LinearRoleRegistry(COMMUNITIES_ROLES))
+        precomputed_time = run(RoleRegistry(COMMUNITIES_ROLES))
+    finally:
+        app.extensions["invenio-communities"].roles_registry = registry
+    print(f"linear: {linear_time:.4f}s, precomputed: {precomputed_time:.4f}s")